@@ -0,0 +1,158 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from helper.runtime import get_setting
+
+TOKENS_PER_WORD = 1.4
+MAX_TOKENS_PER_TEXT = 512
+BATCH_INBOX_DIR = 'data/batch_inbox'
+
+DEGRADE_MODES = {
+    "auto": "Otomatis (sampel; lewati topik bila biaya terlalu besar)",
+    "sample": "Sampel acak",
+    "skip_topics": "Lewati pemodelan topik (lalu sampel bila masih terlalu besar)",
+    "batch": "Simpan sebagai batch job (diproses manual)",
+    "reject": "Tolak",
+}
+
+
+class AdmissionError(Exception):
+    pass
+
+
+def admission_limits():
+    return {
+        "max_rows": get_setting("max_rows", 5000),
+        "max_job_cost": get_setting("max_job_cost", 600_000),
+        "max_running_jobs": get_setting("max_running_jobs", 1),
+        "max_queued_jobs": get_setting("max_queued_jobs", 4),
+        "queue_timeout": get_setting("queue_timeout", 300.0),
+        "degrade_mode": get_setting("degrade_mode", "auto"),
+    }
+
+
+def estimate_cost(texts, skip_topics=False):
+    # Cost is the estimated number of tokens pushed through transformers:
+    # one IndoBERT pass plus, unless skipped, one E5 pass for topics.
+    tokens = sum(
+        min(int(len(t.split()) * TOKENS_PER_WORD) + 2, MAX_TOKENS_PER_TEXT)
+        for t in texts
+    )
+    passes = 1 if skip_topics else 2
+    return {"rows": len(texts), "tokens": tokens, "cost": tokens * passes}
+
+
+def plan_job(texts, mode=None, limits=None):
+    limits = limits or admission_limits()
+    mode = mode or limits["degrade_mode"]
+    est = estimate_cost(texts)
+
+    plan = {
+        "action": "accept",
+        "sample_size": None,
+        "skip_topics": False,
+        "cost": est["cost"],
+        "estimate": est
+    }
+
+    def fits(e):
+        return e["rows"] <= limits["max_rows"] and e["cost"] <= limits["max_job_cost"]
+
+    if fits(est):
+        return plan
+
+    if mode in ("reject", "batch"):
+        plan["action"] = mode
+        return plan
+
+    plan["action"] = "degrade"
+    # auto only drops topics when the token cost is the problem; too many
+    # rows alone are handled by sampling so topics are kept
+    if mode == "skip_topics" or (mode == "auto" and est["cost"] > limits["max_job_cost"]):
+        plan["skip_topics"] = True
+        est = estimate_cost(texts, skip_topics=True)
+        plan["cost"] = est["cost"]
+        if fits(est):
+            return plan
+
+    ratio = min(limits["max_rows"] / est["rows"], limits["max_job_cost"] / est["cost"])
+    plan["sample_size"] = max(1, int(est["rows"] * ratio))
+    plan["cost"] = int(est["cost"] * ratio)
+    return plan
+
+
+def sample_indices(n_total, sample_size, seed=0):
+    return sorted(random.Random(seed).sample(range(n_total), sample_size))
+
+
+def submit_batch_job(texts, df_meta=None, inbox=None):
+    inbox = inbox or get_setting("batch_inbox", BATCH_INBOX_DIR)
+    os.makedirs(inbox, exist_ok=True)
+
+    df = pd.DataFrame({"Text": texts})
+    if df_meta is not None:
+        df = pd.concat([df_meta.reset_index(drop=True), df], axis=1)
+
+    path = os.path.join(inbox, f"job_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+class AdmissionController:
+    """Per-process FIFO queue that bounds concurrent analysis jobs.
+
+    Each session may hold at most one queued or running job.
+    """
+
+    def __init__(self, max_running, max_queued):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self._running = set()
+        self._waiting = []
+        self._cond = threading.Condition()
+
+    def queue_depth(self):
+        with self._cond:
+            return {"running": len(self._running), "waiting": len(self._waiting)}
+
+    @contextmanager
+    def admit(self, session_id, timeout=None):
+        with self._cond:
+            if session_id in self._running or session_id in self._waiting:
+                raise AdmissionError("Sesi ini masih memiliki analisis yang sedang berjalan.")
+            if len(self._running) >= self.max_running and len(self._waiting) >= self.max_queued:
+                raise AdmissionError("Antrean analisis penuh. Silakan coba beberapa saat lagi.")
+
+            self._waiting.append(session_id)
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: len(self._running) < self.max_running
+                    and self._waiting[0] == session_id,
+                    timeout
+                )
+            finally:
+                self._waiting.remove(session_id)
+                self._cond.notify_all()
+
+            if not admitted:
+                raise AdmissionError("Waktu tunggu antrean habis. Silakan coba lagi.")
+            self._running.add(session_id)
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running.discard(session_id)
+                self._cond.notify_all()
+
+
+@st.cache_resource
+def get_admission_controller():
+    limits = admission_limits()
+    return AdmissionController(limits["max_running_jobs"], limits["max_queued_jobs"])
@@ -0,0 +1,51 @@
+import pandas as pd
+import streamlit as st
+
+META_COLUMNS = ["Application", "Date"]
+FREQ_MAP = {
+    "Harian": "D",
+    "Mingguan": "W"
+}
+
+
+def _group_keys(df, freq):
+    keys = []
+    if "Application" in df.columns:
+        keys.append("Application")
+    if "Date" in df.columns:
+        dates = pd.to_datetime(df["Date"], errors="coerce")
+        df["Period"] = dates.dt.to_period(freq).dt.start_time
+        keys.append("Period")
+    return keys
+
+
+@st.cache_data
+def aggregate_sentiment(df_reviews, freq="D"):
+    df = df_reviews.copy()
+    keys = _group_keys(df, freq)
+    if not keys:
+        return pd.DataFrame()
+
+    df["Positive"] = df["Sentiment"].eq("Positif")
+    grouped = df.groupby(keys, dropna=False)
+
+    return grouped.agg(
+        Reviews=("Sentiment", "size"),
+        Positive_Share=("Positive", "mean"),
+        Mean_Confidence=("Confidence", "mean")
+    ).reset_index()
+
+
+@st.cache_data
+def aggregate_topics(df_reviews, freq="D"):
+    df = df_reviews.copy()
+    keys = _group_keys(df, freq)
+    if not keys or "Topic" not in df.columns:
+        return pd.DataFrame()
+
+    return (
+        df.groupby(keys + ["Sentiment", "Topic"], dropna=False)
+        .size()
+        .rename("Reviews")
+        .reset_index()
+    )
@@ -0,0 +1,283 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+import pandas as pd
+
+# Work directory layout (shared by every host taking part):
+#   pending/  shards waiting for a worker
+#   running/  shards claimed by a worker, renamed to <shard>@<worker>
+#   done/     result of each finished shard
+#   failed/   shards that exhausted their retries
+#   errors/   one traceback per failed attempt: <shard>.<attempt>.txt
+#   job.json  the shards this job was split into
+# A worker claims a shard with an atomic rename, so no lock server is needed.
+# One work directory holds exactly one job; split_input refuses to reuse it.
+STATES = ("pending", "running", "done", "failed", "errors")
+JOB_FILE = "job.json"
+
+
+def _dir(workdir, state):
+    return os.path.join(workdir, state)
+
+
+def job_shards(workdir):
+    with open(os.path.join(workdir, JOB_FILE), encoding="utf-8") as f:
+        return json.load(f)["shards"]
+
+
+def split_input(input_csv, workdir, shard_size=1000):
+    if os.path.isdir(workdir) and os.listdir(workdir):
+        # Leftover shards or results would be counted and merged into this job
+        raise ValueError(f"work directory '{workdir}' is not empty; use a new directory per job")
+    for state in STATES:
+        os.makedirs(_dir(workdir, state), exist_ok=True)
+
+    df = pd.read_csv(input_csv)
+    if "Text" not in df.columns:
+        raise ValueError("input CSV must have a 'Text' column")
+
+    # Row is the position in the input, so skipped empty rows leave gaps
+    # instead of shifting every later id
+    df.insert(0, "Row", range(len(df)))
+    df = df[df["Text"].notna()].reset_index(drop=True)
+
+    names = []
+    for start in range(0, len(df), shard_size):
+        name = f"shard_{len(names):05d}.csv"
+        tmp_path = os.path.join(workdir, name + ".tmp")
+        df.iloc[start:start + shard_size].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(_dir(workdir, "pending"), name))
+        names.append(name)
+
+    with open(os.path.join(workdir, JOB_FILE), "w", encoding="utf-8") as f:
+        json.dump({"input": os.path.abspath(input_csv), "shards": names}, f)
+    return len(names)
+
+
+def process_shard(df, models):
+    from helper.pipeline import analyse_reviews
+
+    result = analyse_reviews(df["Text"].astype(str).tolist(), models)
+    out = df.copy()
+    out["Sentiment"] = result["sentiments"]
+    out["Confidence"] = result["confs"]
+    out["Topic"] = [topic for topic, _ in result["topics"]]
+    out["Topic Confidence"] = [conf for _, conf in result["topics"]]
+    return out
+
+
+def _claim(workdir, worker_id):
+    for name in sorted(os.listdir(_dir(workdir, "pending"))):
+        src = os.path.join(_dir(workdir, "pending"), name)
+        dst = os.path.join(_dir(workdir, "running"), f"{name}@{worker_id}")
+        try:
+            os.rename(src, dst)
+        except (FileNotFoundError, PermissionError):
+            continue  # another worker got it first
+        return name, dst
+    return None, None
+
+
+def _attempts(workdir, name):
+    prefix = name + "."
+    return sum(1 for f in os.listdir(_dir(workdir, "errors")) if f.startswith(prefix))
+
+
+def _heartbeat(path, stop, interval):
+    while not stop.wait(interval):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return
+
+
+def run_worker(workdir, worker_id=None, process_fn=None, max_attempts=3,
+               heartbeat=10.0, exit_when_idle=True, poll=2.0):
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    if process_fn is None:
+        from helper.model_loader import load_all_models
+        models = load_all_models()
+        process_fn = lambda df: process_shard(df, models)
+
+    processed = 0
+    while True:
+        name, path = _claim(workdir, worker_id)
+        if name is None:
+            if exit_when_idle:
+                return processed
+            time.sleep(poll)
+            continue
+
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(path, stop, heartbeat), daemon=True)
+        beat.start()
+        try:
+            out = process_fn(pd.read_csv(path))
+            tmp_path = os.path.join(_dir(workdir, "done"), name + f".{worker_id}.tmp")
+            out.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, os.path.join(_dir(workdir, "done"), name))
+            os.remove(path)
+            processed += 1
+        except Exception:
+            attempt = _attempts(workdir, name) + 1
+            with open(os.path.join(_dir(workdir, "errors"), f"{name}.{attempt}.txt"), "w") as f:
+                f.write(f"worker: {worker_id}\n{traceback.format_exc()}")
+            target = "pending" if attempt < max_attempts else "failed"
+            os.replace(path, os.path.join(_dir(workdir, target), name))
+        finally:
+            stop.set()
+
+
+def requeue_stale(workdir, stale_after):
+    # Shards whose worker stopped sending heartbeats (crashed process or host)
+    now = time.time()
+    requeued = 0
+    for entry in os.listdir(_dir(workdir, "running")):
+        path = os.path.join(_dir(workdir, "running"), entry)
+        try:
+            if now - os.path.getmtime(path) > stale_after:
+                name = entry.split("@", 1)[0]
+                os.replace(path, os.path.join(_dir(workdir, "pending"), name))
+                requeued += 1
+        except FileNotFoundError:
+            continue
+    return requeued
+
+
+def shard_status(workdir):
+    # Only this job's shards count; anything else in the directories is ignored
+    shards = set(job_shards(workdir))
+    return {
+        state: len([
+            f for f in os.listdir(_dir(workdir, state))
+            if f.split("@", 1)[0] in shards
+        ])
+        for state in STATES if state != "errors"
+    }
+
+
+def fail_pending(workdir, reason):
+    failed = 0
+    for name in os.listdir(_dir(workdir, "pending")):
+        attempt = _attempts(workdir, name) + 1
+        with open(os.path.join(_dir(workdir, "errors"), f"{name}.{attempt}.txt"), "w") as f:
+            f.write(f"coordinator: {reason}\n")
+        try:
+            os.replace(os.path.join(_dir(workdir, "pending"), name),
+                       os.path.join(_dir(workdir, "failed"), name))
+            failed += 1
+        except FileNotFoundError:
+            continue  # claimed meanwhile by a remote worker
+    return failed
+
+
+def coordinate(workdir, n_shards, poll=2.0, stale_after=60.0, workers=None, max_respawns=3):
+    respawns = 0
+    while True:
+        status = shard_status(workdir)
+        if status["done"] + status["failed"] >= n_shards:
+            return status
+
+        requeue_stale(workdir, stale_after)
+
+        # Restart local workers that exited while shards are still pending,
+        # up to max_respawns in total so a crash loop cannot run forever
+        if workers is not None and status["pending"]:
+            for i, proc in enumerate(workers):
+                if proc.poll() is not None and respawns < max_respawns:
+                    workers[i] = _spawn_worker(workdir)
+                    respawns += 1
+            if respawns >= max_respawns and all(proc.poll() is not None for proc in workers):
+                fail_pending(workdir, f"local workers exited after {respawns} respawns")
+
+        time.sleep(poll)
+
+
+def merge_results(workdir, output_csv):
+    done_dir = _dir(workdir, "done")
+    names = sorted(set(job_shards(workdir)) & set(os.listdir(done_dir)))
+    frames = [pd.read_csv(os.path.join(done_dir, name)) for name in names]
+    if not frames:
+        raise RuntimeError("no finished shards to merge")
+
+    merged = pd.concat(frames, ignore_index=True).sort_values("Row", kind="stable")
+    merged.to_csv(output_csv, index=False)
+    return merged
+
+
+def _spawn_worker(workdir):
+    return subprocess.Popen(
+        [sys.executable, "-m", "helper.batch", "worker", "--workdir", workdir]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded batch scoring of reviews")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="split, score with local workers and merge")
+    p_run.add_argument("input")
+    p_run.add_argument("output")
+    p_run.add_argument("--workdir", required=True)
+    p_run.add_argument("--shard-size", type=int, default=1000)
+    p_run.add_argument("--local-workers", type=int, default=2)
+    p_run.add_argument("--stale-after", type=float, default=60.0)
+    p_run.add_argument("--max-respawns", type=int, default=3)
+
+    p_split = sub.add_parser("split", help="split an input CSV into pending shards")
+    p_split.add_argument("input")
+    p_split.add_argument("--workdir", required=True)
+    p_split.add_argument("--shard-size", type=int, default=1000)
+
+    p_worker = sub.add_parser("worker", help="process shards until none are pending")
+    p_worker.add_argument("--workdir", required=True)
+    p_worker.add_argument("--max-attempts", type=int, default=3)
+    p_worker.add_argument("--wait", action="store_true",
+                          help="keep polling for new shards instead of exiting when idle")
+
+    p_coord = sub.add_parser("coordinate", help="watch remote workers and merge when done")
+    p_coord.add_argument("output")
+    p_coord.add_argument("--workdir", required=True)
+    p_coord.add_argument("--stale-after", type=float, default=60.0)
+
+    args = parser.parse_args()
+
+    if args.command == "split":
+        print(f"{split_input(args.input, args.workdir, args.shard_size)} shards written")
+
+    elif args.command == "worker":
+        n = run_worker(args.workdir, max_attempts=args.max_attempts,
+                       exit_when_idle=not args.wait)
+        print(f"worker processed {n} shards")
+
+    elif args.command == "coordinate":
+        n_shards = len(job_shards(args.workdir))
+        status = coordinate(args.workdir, n_shards, stale_after=args.stale_after)
+        merge_results(args.workdir, args.output)
+        print(status)
+
+    elif args.command == "run":
+        n_shards = split_input(args.input, args.workdir, args.shard_size)
+        workers = [_spawn_worker(args.workdir) for _ in range(args.local_workers)]
+        try:
+            status = coordinate(args.workdir, n_shards, stale_after=args.stale_after,
+                                workers=workers, max_respawns=args.max_respawns)
+        finally:
+            for proc in workers:
+                proc.wait()
+        merge_results(args.workdir, args.output)
+        print(status)
+        if status["failed"]:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from data.sample_texts import SAMPLE_TEXTS
+from helper.preprocessing import preprocess_batch
+from helper.predict_sentiment import predict_sentiment
+from helper.predict_topic import predict_topics, embed_texts
+from helper.runtime import CPU_COUNT, PRECISIONS, set_intra_op_threads, thread_settings
+
+
+def _timed(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def thread_sweep(texts, models, thread_counts, repeats=3):
+    cleaned = preprocess_batch(texts)
+    rows = []
+
+    try:
+        for n in thread_counts:
+            effective = set_intra_op_threads(n)
+
+            sent_sec = _timed(
+                lambda: predict_sentiment(cleaned, models["tokenizer"], models["sa_mod"]),
+                repeats
+            )
+            topic_sec = _timed(
+                lambda: predict_topics(models["pos_mod"], cleaned),
+                repeats
+            )
+
+            for stage, sec in (("sentiment", sent_sec), ("topic", topic_sec)):
+                rows.append({
+                    "Threads": n,
+                    "Torch threads": effective["torch"],
+                    # UMAP/HDBSCAN run under numba, capped by NUMBA_NUM_THREADS
+                    "Numba threads": effective["numba"],
+                    "Stage": stage,
+                    "Seconds": sec,
+                    "Texts/s": len(cleaned) / sec
+                })
+    finally:
+        set_intra_op_threads(thread_settings()["intra_op_threads"])
+
+    return pd.DataFrame(rows)
+
+
+def evaluate_cascade(texts, models, fast_model, threshold=0.9):
+    cleaned = preprocess_batch(texts)
+    tokenizer, sa_mod = models["tokenizer"], models["sa_mod"]
+
+    start = time.perf_counter()
+    full_sents, _ = predict_sentiment(cleaned, tokenizer, sa_mod)
+    full_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_sents, fast_confs = predict_sentiment(
+        cleaned, tokenizer, sa_mod, fast_model=fast_model, threshold=threshold
+    )
+    cascade_sec = time.perf_counter() - start
+
+    fast_only = fast_model.predict_proba(cleaned).max(axis=1) >= threshold
+    agree = sum(a == b for a, b in zip(full_sents, fast_sents))
+
+    return {
+        "threshold": threshold,
+        "routed_to_transformer": float(1 - fast_only.mean()),
+        "accuracy_vs_sa_mod": agree / len(cleaned),
+        "full_seconds": full_sec,
+        "cascade_seconds": cascade_sec,
+        "speedup": full_sec / cascade_sec if cascade_sec else float("inf")
+    }
+
+
+def compare_precisions(texts, models, repeats=3, conf_tol=0.02, emb_tol=0.995):
+    cleaned = preprocess_batch(texts)
+    tokenizer, sa_mod = models["tokenizer"], models["sa_mod"]
+    rows = []
+    ref = None
+
+    for precision in PRECISIONS:
+        sents, confs = predict_sentiment(cleaned, tokenizer, sa_mod, precision=precision)
+        embs = embed_texts(models["pos_mod"], cleaned, precision=precision)
+
+        sent_sec = _timed(
+            lambda: predict_sentiment(cleaned, tokenizer, sa_mod, precision=precision),
+            repeats
+        )
+        emb_sec = _timed(
+            lambda: embed_texts(models["pos_mod"], cleaned, precision=precision),
+            repeats
+        )
+
+        if ref is None:
+            ref = (sents, confs, embs)
+
+        label_agree = sum(a == b for a, b in zip(sents, ref[0])) / len(cleaned)
+        max_conf_diff = float(abs(confs - ref[1]).max())
+        emb_cos = float((
+            (embs * ref[2]).sum(axis=1)
+            / (np.linalg.norm(embs, axis=1) * np.linalg.norm(ref[2], axis=1))
+        ).min())
+
+        rows.append({
+            "Precision": precision,
+            "Sentiment texts/s": len(cleaned) / sent_sec,
+            "Embedding texts/s": len(cleaned) / emb_sec,
+            "Label agreement": label_agree,
+            "Max confidence diff": max_conf_diff,
+            "Min embedding cosine": emb_cos,
+            "Within tolerance": label_agree == 1.0 and max_conf_diff <= conf_tol and emb_cos >= emb_tol
+        })
+
+    return pd.DataFrame(rows)
+
+
+PAGES = {
+    "Halo": "🚌_Halo!.py",
+    "Data & Metode": "pages/1_📊_Data_&_Metode.py",
+    "Analisis": "pages/2_⚙️_Analisis.py",
+    "Tutorial": "pages/3_💡_Tutorial.py",
+}
+
+# Seconds to import each page's module-level dependencies in a fresh process
+IMPORT_BUDGETS = {
+    "Halo": 1.5,
+    "Data & Metode": 1.5,
+    "Analisis": 2.0,
+    "Tutorial": 1.0,
+}
+
+
+def page_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def import_time(path):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", page_imports(path)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {path} failed:\n{result.stderr}")
+
+    # "import time: self [us] | cumulative | imported package"
+    total_us = 0
+    heaviest = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):  # top-level import
+            heaviest.append((int(cumulative_us), name.strip()))
+
+    heaviest.sort(reverse=True)
+    return total_us / 1e6, [name for _, name in heaviest[:3]]
+
+
+def check_import_budgets(budgets=IMPORT_BUDGETS):
+    rows = []
+    for page, path in PAGES.items():
+        seconds, heaviest = import_time(path)
+        rows.append({
+            "Page": page,
+            "Seconds": seconds,
+            "Budget": budgets[page],
+            "Within budget": seconds <= budgets[page],
+            "Heaviest imports": ", ".join(heaviest)
+        })
+    return pd.DataFrame(rows)
+
+
+def _default_thread_counts():
+    counts = []
+    n = 1
+    while n < CPU_COUNT:
+        counts.append(n)
+        n *= 2
+    counts.append(CPU_COUNT)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the inference pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_threads = sub.add_parser("threads", help="throughput against thread count")
+    p_threads.add_argument("--threads", type=int, nargs="+", default=None)
+    p_threads.add_argument("--repeat-texts", type=int, default=8)
+    p_threads.add_argument("--repeats", type=int, default=3)
+
+    p_cascade = sub.add_parser("cascade", help="fast-model cascade against sa_mod")
+    p_cascade.add_argument(
+        "csv", nargs="?", default=None,
+        help="CSV with a 'Text' column not used for distillation "
+             "(default: the held-out split written by helper.fast_sentiment)"
+    )
+    p_cascade.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.9, 0.95])
+
+    sub.add_parser("warmup", help="cold versus warm latency per stage")
+
+    sub.add_parser("importtime", help="page import time against IMPORT_BUDGETS (exit 1 if over)")
+
+    p_calib = sub.add_parser("calibration", help="ECE of raw versus calibrated confidence")
+    p_calib.add_argument("csv", help="labelled CSV with 'Text' and 'Sentiment' columns")
+
+    p_precision = sub.add_parser("precision", help="fp32 versus bf16 throughput and drift")
+    p_precision.add_argument("--repeat-texts", type=int, default=8)
+
+    args = parser.parse_args()
+
+    if args.command == "threads":
+        counts = args.threads or _default_thread_counts()
+        # configure_threads() fixes the numba ceiling when models load, so
+        # raise it to the largest count swept or numba is silently capped
+        os.environ["JKT_INTRA_OP_THREADS"] = str(max(counts))
+
+        from helper.model_loader import load_all_models
+        models = load_all_models()
+        texts = SAMPLE_TEXTS * args.repeat_texts
+        print(thread_sweep(texts, models, counts, args.repeats).to_string(index=False))
+
+    elif args.command == "cascade":
+        from helper.model_loader import load_all_models
+        from helper.fast_sentiment import load_fast_model, HOLDOUT_PATH
+        models = load_all_models()
+        fast_model = load_fast_model()
+        if fast_model is None:
+            parser.error("no fast model found; run python -m helper.fast_sentiment first")
+        csv_path = args.csv or HOLDOUT_PATH
+        print(f"Evaluating on {csv_path}")
+        texts = pd.read_csv(csv_path)["Text"].dropna().astype(str).tolist()
+        rows = [evaluate_cascade(texts, models, fast_model, t) for t in args.thresholds]
+        print(pd.DataFrame(rows).to_string(index=False))
+
+    elif args.command == "warmup":
+        from helper.model_loader import load_all_models, warm_up_models
+        models = load_all_models()
+        report = models.get("warmup") or warm_up_models(models)
+        df = pd.DataFrame(report).T
+        df["cold/warm"] = df["cold"] / df["warm"]
+        print(df.to_string())
+
+    elif args.command == "importtime":
+        df = check_import_budgets()
+        print(df.to_string(index=False))
+        if not df["Within budget"].all():
+            sys.exit(1)
+
+    elif args.command == "calibration":
+        from helper.model_loader import load_all_models
+        from helper.calibration import load_labelled, collect_logits, calibration_report
+        models = load_all_models()
+        cleaned, labels = load_labelled(args.csv, models["sa_mod"])
+        logits = collect_logits(cleaned, models["tokenizer"], models["sa_mod"])
+        report = calibration_report(logits, labels, models.get("temperature", 1.0))
+        print(report.to_string(index=False))
+
+    elif args.command == "precision":
+        from helper.model_loader import load_all_models
+        models = load_all_models()
+        texts = SAMPLE_TEXTS * args.repeat_texts
+        print(compare_precisions(texts, models).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
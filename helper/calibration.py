@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from helper.predict_sentiment import LABEL_MAP, encode_texts
+from helper.preprocessing import preprocess_batch
+from helper.runtime import inference_context
+
+CALIBRATION_PATH = 'data/sentiment_calibration.json'
+
+
+def load_calibration(path=CALIBRATION_PATH):
+    # Read on every model load (not cached) so a hot swap picks up a
+    # temperature fitted after the process started
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def collect_logits(cleaned_texts, tokenizer, model, batch_size=64):
+    import torch
+
+    chunks = []
+    for i in range(0, len(cleaned_texts), batch_size):
+        inputs = encode_texts(cleaned_texts[i:i + batch_size], tokenizer)
+        with inference_context("fp32"):
+            chunks.append(model(**inputs).logits.float())
+    return torch.cat(chunks)
+
+
+def fit_temperature(logits, labels, max_iter=100):
+    import torch
+
+    # Optimise log T so the temperature stays positive
+    logits = torch.as_tensor(logits, dtype=torch.float32)
+    labels = torch.as_tensor(labels, dtype=torch.long)
+    log_t = torch.zeros(1, requires_grad=True)
+    optimizer = torch.optim.LBFGS([log_t], lr=0.1, max_iter=max_iter)
+
+    def closure():
+        optimizer.zero_grad()
+        loss = torch.nn.functional.cross_entropy(logits / log_t.exp(), labels)
+        loss.backward()
+        return loss
+
+    optimizer.step(closure)
+    return float(log_t.exp().item())
+
+
+def expected_calibration_error(confs, correct, n_bins=15):
+    confs = np.asarray(confs, dtype=np.float64)
+    correct = np.asarray(correct, dtype=np.float64)
+    bins = np.minimum((confs * n_bins).astype(int), n_bins - 1)
+
+    counts = np.bincount(bins, minlength=n_bins)
+    conf_sum = np.bincount(bins, weights=confs, minlength=n_bins)
+    acc_sum = np.bincount(bins, weights=correct, minlength=n_bins)
+
+    filled = counts > 0
+    gaps = np.abs(acc_sum[filled] - conf_sum[filled])
+    return float(gaps.sum() / len(confs))
+
+
+def calibration_report(logits, labels, temperature):
+    import torch
+
+    logits = torch.as_tensor(logits, dtype=torch.float32)
+    labels = np.asarray(labels)
+    rows = []
+    for name, t in (("raw", 1.0), ("calibrated", temperature)):
+        confs, preds = torch.max(torch.softmax(logits / t, dim=1), dim=1)
+        rows.append({
+            "Confidence": name,
+            "Temperature": t,
+            "Accuracy": float((preds.numpy() == labels).mean()),
+            "Mean confidence": float(confs.mean()),
+            "ECE": expected_calibration_error(confs.numpy(), preds.numpy() == labels)
+        })
+    return pd.DataFrame(rows)
+
+
+def load_labelled(path, model):
+    df = pd.read_csv(path).dropna(subset=["Text", "Sentiment"])
+    label_ids = {
+        LABEL_MAP[name]: idx for idx, name in model.config.id2label.items()
+    }
+    return preprocess_batch(df["Text"].astype(str).tolist()), df["Sentiment"].map(label_ids).to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit temperature scaling for the sentiment model")
+    parser.add_argument("csv", help="held-out CSV with 'Text' and 'Sentiment' (Positif/Negatif) columns")
+    parser.add_argument("--output", default=CALIBRATION_PATH)
+    parser.add_argument("--repo", default=None, help="sentiment model repo (default: SENTIMENT_REPO)")
+    parser.add_argument("--revision", default=None,
+                        help="Hub commit, branch or tag, as in the manifest's sentiment_revision")
+    args = parser.parse_args()
+
+    from helper.model_loader import load_sentiment_model, SENTIMENT_REPO
+    from helper.runtime import configure_threads
+    configure_threads()
+    models = load_sentiment_model(args.repo or SENTIMENT_REPO, args.revision)
+
+    cleaned, labels = load_labelled(args.csv, models["sa_mod"])
+    logits = collect_logits(cleaned, models["tokenizer"], models["sa_mod"])
+    temperature = fit_temperature(logits, labels)
+    report = calibration_report(logits, labels, temperature)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "model": models["sentiment_repo"],
+            "revision": models["sentiment_revision"],
+            "temperature": temperature,
+            "n_samples": len(labels),
+            "ece_raw": report.loc[0, "ECE"],
+            "ece_calibrated": report.loc[1, "ECE"]
+        }, f, indent=2)
+
+    print(report.to_string(index=False))
+    print(f"Saved temperature {temperature:.4f} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
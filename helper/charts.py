@@ -1,10 +1,18 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
 
+def _pyplot():
+    # matplotlib is only imported once a chart is actually drawn
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def close_chart(fig):
+    _pyplot().close(fig)
+
 def bar_chart(df, x_col, y_col, is_sentiment=False):   
+    plt = _pyplot()
     if is_sentiment:
         df_plot = df[df[x_col].str.lower() != 'netral'].copy()
     else:
@@ -32,6 +40,7 @@ def bar_chart(df, x_col, y_col, is_sentiment=False):
     plt.close(fig)
 
 def resample_chart(df):  
+    plt = _pyplot()
     cmap = plt.get_cmap('berlin')
         
     color_neg = cmap(0.8)  # Color for Negative
@@ -71,6 +80,7 @@ def resample_chart(df):
     plt.close(fig)
 
 def sentiment_bar_chart(sent_counts):
+    plt = _pyplot()
     cmap = plt.get_cmap("berlin")
 
     color_pos = cmap(0.2)
@@ -118,6 +128,7 @@ def sentiment_bar_chart(sent_counts):
     plt.close(fig)
 
 def topic_bar_chart(topic_counts, title, cmap_range=(0.2, 0.8), figsize=(5,3)):
+    plt = _pyplot()
     cmap = plt.get_cmap("berlin")
 
     colors = cmap(np.linspace(*cmap_range, len(topic_counts)))
@@ -0,0 +1,129 @@
+import hashlib
+import numpy as np
+
+from helper.fast_sentiment import NEGATORS
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+MERSENNE_PRIME = (1 << 31) - 1
+
+_rng = np.random.default_rng(0)
+_PERM_A = _rng.integers(1, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.int64)
+_PERM_B = _rng.integers(0, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.int64)
+
+
+def _token_hashes(tokens):
+    return np.array([
+        int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "big")
+        % MERSENNE_PRIME
+        for t in tokens
+    ], dtype=np.int64)
+
+
+def minhash(tokens):
+    # a*x + b stays below 2**62, so int64 arithmetic cannot overflow
+    hashes = _token_hashes(tokens)
+    return ((np.outer(hashes, _PERM_A) + _PERM_B) % MERSENNE_PRIME).min(axis=0)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def _near_duplicate_groups(texts, threshold):
+    token_sets = [set(t.split()) for t in texts]
+    negators = [tokens & NEGATORS for tokens in token_sets]
+    root = list(range(len(texts)))
+    size = [1] * len(texts)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+
+    def joins(text, rep):
+        # Compared with the cluster representative, not with whichever member
+        # matched, so clusters cannot chain through intermediate texts. A
+        # differing negator ("tidak membantu" vs "membantu") flips the
+        # sentiment, so such texts never share a representative.
+        return (negators[text] == negators[rep]
+                and jaccard(token_sets[text], token_sets[rep]) >= threshold)
+
+    # LSH: texts sharing any band of their MinHash signature become
+    # candidates (~0.9998 recall at Jaccard 0.8); candidates are then
+    # confirmed with the exact Jaccard similarity of their token sets.
+    signatures = {i: minhash(tokens) for i, tokens in enumerate(token_sets) if tokens}
+    for band in range(LSH_BANDS):
+        buckets = {}
+        for i, sig in signatures.items():
+            buckets.setdefault(sig[band * rows:(band + 1) * rows].tobytes(), []).append(i)
+
+        for members in buckets.values():
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1:]:
+                    ra, rb = root[a], root[b]
+                    if ra == rb:
+                        continue
+                    # Only a text that is still on its own may join a cluster,
+                    # so every member stays within `threshold` of its root
+                    if rb == b and size[b] == 1 and joins(b, ra):
+                        root[b] = ra
+                        size[ra] += 1
+                    elif ra == a and size[a] == 1 and joins(a, rb):
+                        root[a] = rb
+                        size[rb] += 1
+
+    return root
+
+
+def dedup_texts(cleaned_texts, near_duplicates=False, threshold=0.8):
+    """Collapse identical (and optionally near-identical) cleaned texts.
+
+    Returns the representative texts and an `inverse` array such that
+    `unique_texts[inverse[i]]` is the representative of `cleaned_texts[i]`.
+    Near duplicates are texts whose token-set Jaccard similarity with the
+    group's representative is at least `threshold` and that contain the
+    same negators.
+    """
+    if not 0.0 < threshold <= 1.0:
+        raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+    unique_texts = []
+    first_index = {}
+    inverse = np.empty(len(cleaned_texts), dtype=np.int64)
+
+    for i, text in enumerate(cleaned_texts):
+        if text not in first_index:
+            first_index[text] = len(unique_texts)
+            unique_texts.append(text)
+        inverse[i] = first_index[text]
+
+    if near_duplicates and len(unique_texts) > 1:
+        roots = _near_duplicate_groups(unique_texts, threshold)
+
+        representatives = {}
+        remap = np.empty(len(unique_texts), dtype=np.int64)
+        collapsed = []
+        for i, root in enumerate(roots):
+            if root not in representatives:
+                representatives[root] = len(collapsed)
+                collapsed.append(unique_texts[root])
+            remap[i] = representatives[root]
+
+        unique_texts = collapsed
+        inverse = remap[inverse]
+
+    return unique_texts, inverse
+
+
+def fan_out(values, inverse):
+    if isinstance(values, np.ndarray):
+        return values[inverse]
+    return [values[i] for i in inverse]
+
+
+def dedup_report(inverse, n_unique):
+    total = len(inverse)
+    saved = total - n_unique
+    return {
+        "total": total,
+        "unique": n_unique,
+        "saved": saved,
+        "saved_ratio": saved / total if total else 0.0
+    }
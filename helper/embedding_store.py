@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import streamlit as st
+
+from helper.runtime import get_setting, resolve_precision
+
+STORE_DIR = 'data/embeddings'
+
+
+def text_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Append-only float16 vector store backed by a memory-mapped file.
+
+    Rows are keyed by the SHA-1 of the cleaned text. `meta.json` ties the
+    store to one embedding model revision and inference precision (it is
+    reset if either changes, so bf16 and fp32 vectors never mix) and `keys.log` records one text per row, appended after the
+    row's vector has been flushed, so a Run only writes what it added.
+    """
+
+    def __init__(self, directory, revision, precision):
+        self.directory = directory
+        self.revision = revision
+        self.precision = precision
+        self.vectors_path = os.path.join(directory, "vectors.f16")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.log_path = os.path.join(directory, "keys.log")
+        self.dim = None
+        self.keys = {}
+        self.texts = []
+        self._vectors = None
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("revision") != self.revision or meta.get("precision") != self.precision:
+            # Stale store from another revision: start over
+            for path in (self.meta_path, self.log_path, self.vectors_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+
+        self.dim = meta["dim"]
+        self._capacity = os.path.getsize(self.vectors_path) // (self.dim * 2)
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                valid = 0
+                for line in f:
+                    if not line.endswith(b"\n") or len(self.texts) >= self._capacity:
+                        # Torn append from an interrupted Run: drop it so
+                        # the next append starts on a clean line
+                        break
+                    text = json.loads(line)
+                    self.keys[text_key(text)] = len(self.texts)
+                    self.texts.append(text)
+                    valid += len(line)
+                f.truncate(valid)
+        if self._capacity:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float16, mode="r+",
+                shape=(self._capacity, self.dim)
+            )
+
+    def _write_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"revision": self.revision, "precision": self.precision, "dim": self.dim}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _reserve(self, rows):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2, 1024)
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        mode = "r+" if self._capacity else "w+"
+        if mode == "r+":
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(capacity * self.dim * 2)
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=np.float16, mode=mode,
+            shape=(capacity, self.dim)
+        )
+        self._capacity = capacity
+
+    def get_many(self, texts):
+        """Return a float32 matrix (NaN rows where missing) and missing positions."""
+        with self._lock:
+            rows = [self.keys.get(text_key(t)) for t in texts]
+            missing = [i for i, r in enumerate(rows) if r is None]
+            if self.dim is None:
+                return None, missing
+
+            embs = np.full((len(texts), self.dim), np.nan, dtype=np.float32)
+            found = [i for i, r in enumerate(rows) if r is not None]
+            if found:
+                embs[found] = self._vectors[[rows[i] for i in found]]
+            return embs, missing
+
+    def add_many(self, texts, embs):
+        embs = np.asarray(embs)
+        with self._lock:
+            if self.dim is None:
+                self.dim = embs.shape[1]
+                self._write_meta()
+
+            new = {}
+            for text, emb in zip(texts, embs):
+                key = text_key(text)
+                if key not in self.keys and key not in new:
+                    new[key] = (text, emb)
+            if not new:
+                return
+
+            start = len(self.texts)
+            self._reserve(start + len(new))
+            for offset, (_, emb) in enumerate(new.values()):
+                self._vectors[start + offset] = emb.astype(np.float16)
+            self._vectors.flush()
+
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                for offset, (key, (text, _)) in enumerate(new.items()):
+                    f.write(json.dumps(text) + "\n")
+                    self.keys[key] = start + offset
+                    self.texts.append(text)
+
+    def vectors(self):
+        with self._lock:
+            if self.dim is None:
+                return np.empty((0, 0), dtype=np.float32)
+            return np.asarray(self._vectors[:len(self.texts)], dtype=np.float32)
+
+
+def embedding_revision(embedding_model):
+    """Identify the embedder as `<model name>@<HF commit hash>`.
+
+    `embedding_model` is BERTopic's sentence-transformers backend; the
+    commit hash is the snapshot transformers resolved when loading the
+    weights, so the store survives BERTopic retraining but not a new E5
+    checkpoint. Models loaded from a local path report `@local`.
+    """
+    sentence_model = getattr(embedding_model, "embedding_model", embedding_model)
+    config = sentence_model[0].auto_model.config
+    commit = getattr(config, "_commit_hash", None) or "local"
+    return f"{config._name_or_path}@{commit}"
+
+
+@st.cache_resource
+def get_embedding_store(revision, precision=None):
+    precision = resolve_precision(precision)
+    # Revisions contain '/' and '@', so the directory is named by a digest
+    name = hashlib.sha1(f"{revision}:{precision}".encode("utf-8")).hexdigest()[:16]
+    directory = os.path.join(get_setting("embedding_store_dir", STORE_DIR), name)
+    return EmbeddingStore(directory, revision, precision)
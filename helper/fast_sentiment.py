@@ -0,0 +1,114 @@
+import argparse
+import hashlib
+import os
+
+import pandas as pd
+import streamlit as st
+
+from helper.predict_sentiment import predict_sentiment
+from helper.preprocessing import preprocess_batch
+
+STOPWORDS_PATH = 'data/tala-stopwords-indonesia.txt'
+FAST_MODEL_PATH = 'data/fast_sentiment.joblib'
+HOLDOUT_PATH = 'data/fast_sentiment_holdout.csv'
+
+# Stopwords that carry polarity: negators flip it and intensifiers or
+# evaluative words scale it, so an n-gram model must keep them.
+NEGATORS = {
+    "tidak", "tidaklah", "tak", "bukan", "bukanlah", "belum", "jangan",
+    "jangankan", "enggak", "tanpa", "kurang",
+}
+SENTIMENT_WORDS = NEGATORS | {
+    "baik", "benar", "betul",
+    "sangat", "amat", "sekali", "terlalu", "paling", "lebih", "cukup",
+    "agak", "makin", "semakin", "hampir", "masih", "bisa",
+}
+
+
+def load_stopwords(path=STOPWORDS_PATH):
+    with open(path, encoding="utf-8") as f:
+        words = [line.strip() for line in f if line.strip()]
+    return [w for w in words if w not in SENTIMENT_WORDS]
+
+
+def is_holdout(cleaned_text, fraction):
+    # Hash split, so duplicates of a review always land on the same side
+    bucket = int(hashlib.sha1(cleaned_text.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return bucket < fraction
+
+
+def build_fast_model(stopwords):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    return make_pipeline(
+        HashingVectorizer(
+            ngram_range=(1, 2),
+            n_features=2 ** 20,
+            stop_words=stopwords,
+            alternate_sign=False,
+            norm="l2"
+        ),
+        LogisticRegression(max_iter=1000, class_weight="balanced")
+    )
+
+
+def teacher_labels(cleaned_texts, tokenizer, sa_mod, batch_size=64):
+    labels = []
+    for i in range(0, len(cleaned_texts), batch_size):
+        sents, _ = predict_sentiment(cleaned_texts[i:i + batch_size], tokenizer, sa_mod)
+        labels.extend(sents)
+    return labels
+
+
+def distill_fast_model(cleaned_texts, tokenizer, sa_mod, batch_size=64):
+    labels = teacher_labels(cleaned_texts, tokenizer, sa_mod, batch_size)
+    fast_model = build_fast_model(load_stopwords())
+    fast_model.fit(cleaned_texts, labels)
+    return fast_model
+
+
+@st.cache_resource
+def load_fast_model(path=FAST_MODEL_PATH):
+    if not os.path.exists(path):
+        return None
+
+    import joblib
+    return joblib.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Distill the IndoBERT sentiment model into a hashed n-gram classifier"
+    )
+    parser.add_argument("csv", help="CSV file with a 'Text' column of unlabelled reviews")
+    parser.add_argument("--output", default=FAST_MODEL_PATH)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="fraction of reviews kept out of training for the cascade benchmark")
+    parser.add_argument("--holdout-output", default=HOLDOUT_PATH)
+    args = parser.parse_args()
+
+    import joblib
+    from helper.model_loader import load_all_models
+    models = load_all_models()
+
+    texts = pd.read_csv(args.csv)["Text"].dropna().astype(str).tolist()
+    cleaned = preprocess_batch(texts)
+    held_out = [is_holdout(c, args.holdout) for c in cleaned]
+
+    train = [c for c, h in zip(cleaned, held_out) if not h]
+    fast_model = distill_fast_model(
+        train, models["tokenizer"], models["sa_mod"], args.batch_size
+    )
+    joblib.dump(fast_model, args.output)
+    pd.DataFrame({"Text": [t for t, h in zip(texts, held_out) if h]}).to_csv(
+        args.holdout_output, index=False
+    )
+    print(f"Saved fast sentiment model trained on {len(train)} reviews to {args.output}")
+    print(f"Saved {len(cleaned) - len(train)} held-out reviews to {args.holdout_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ def compute_sentiment_metrics(df_sent):
         "counts": sent_counts
     }
 
-def sentiment_interpretation(metrics):
+def sentiment_interpretation(metrics, calibrated=False):
     pos = metrics["pos"]
     neg = metrics["neg"]
 
@@ -25,12 +25,31 @@ def sentiment_interpretation(metrics):
     else:
         summary = "memiliki distribusi sentimen yang relatif seimbang"
 
+    if metrics["avg_conf"] >= 0.8:
+        conf_note = (
+            "Nilai confidence rata-rata yang relatif tinggi mengindikasikan bahwa "
+            "model cukup yakin dalam mengklasifikasikan sentimen ulasan pengguna."
+        )
+    elif metrics["avg_conf"] >= 0.65:
+        conf_note = (
+            "Nilai confidence rata-rata berada pada tingkat sedang, sehingga sebagian "
+            "prediksi sebaiknya ditinjau kembali."
+        )
+    else:
+        conf_note = (
+            "Nilai confidence rata-rata yang rendah menunjukkan banyak ulasan yang "
+            "ambigu bagi model, sehingga hasil perlu ditafsirkan dengan hati-hati."
+        )
+
+    if calibrated:
+        conf_note += " Nilai confidence telah dikalibrasi sehingga mendekati peluang prediksi benar."
+    else:
+        conf_note += " Nilai confidence belum dikalibrasi dan dapat melebih-lebihkan keandalan model."
+
     return (
         f"Dari total {metrics['total']} ulasan yang dianalisis, "
         f"hasil menunjukkan bahwa distribusi sentimen {summary}. "
-        "Nilai confidence rata-rata yang relatif tinggi mengindikasikan bahwa "
-        "model memiliki tingkat keandalan yang baik dalam mengklasifikasikan "
-        "sentimen ulasan pengguna."
+        f"{conf_note}"
     )
 
 def format_topic_label(topic_id, label_map):
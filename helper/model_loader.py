@@ -1,26 +1,114 @@
+import time
 import streamlit as st
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from bertopic import BERTopic
+from helper.runtime import configure_threads, get_setting
+from helper.embedding_store import embedding_revision
+from helper.calibration import CALIBRATION_PATH, load_calibration
+from helper.preprocessing import preprocess_batch
+from helper.predict_sentiment import predict_sentiment
+from helper.predict_topic import predict_topics, embed_texts
+from data.sample_texts import SAMPLE_TEXTS
 
 SENTIMENT_REPO = "chimons-academy/indobert-jkt-transpub-app-review"
 TOPIC_POS_REPO = "chimons-academy/bertopic-jkt-transpub-app-pos-review"
 TOPIC_NEG_REPO = "chimons-academy/bertopic-jkt-transpub-app-neg-review"
+LABELS_PATH = 'data/data.xlsx'
 
 
-@st.cache_resource
-def load_all_models():
-    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_REPO)
-    sa_mod = AutoModelForSequenceClassification.from_pretrained(
-        SENTIMENT_REPO
-    )
-    sa_mod.eval()
+def warm_up_models(models, texts=SAMPLE_TEXTS):
+    stages = {
+        "preprocess": lambda: preprocess_batch(texts),
+    }
+    cleaned = preprocess_batch(texts)
+    stages.update({
+        "sentiment": lambda: predict_sentiment(cleaned, models["tokenizer"], models["sa_mod"]),
+        "embedding": lambda: embed_texts(models["pos_mod"], cleaned),
+        "topic_pos": lambda: predict_topics(models["pos_mod"], cleaned),
+        "topic_neg": lambda: predict_topics(models["neg_mod"], cleaned),
+    })
+
+    report = {}
+    for name, fn in stages.items():
+        start = time.perf_counter()
+        fn()
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fn()
+        warm = time.perf_counter() - start
+
+        report[name] = {"cold": cold, "warm": warm}
+
+    return report
+
+
+def load_topic_labels(path=LABELS_PATH):
+    import pandas as pd
+
+    labels = {}
+    for key, sheet in (("pos", "pos_lab"), ("neg", "neg_lab")):
+        df = pd.read_excel(path, sheet_name=sheet)
+        labels[key] = dict(zip(df["Topic"], df["Label"]))
+    return labels
+
+
+def _load_topic_model(repo, revision=None):
+    from bertopic import BERTopic
+
+    if revision is not None:
+        # BERTopic.load cannot pin a Hub revision, so load that snapshot from disk
+        from huggingface_hub import snapshot_download
+        repo = snapshot_download(repo, revision=revision)
+    return BERTopic.load(repo)
+
 
-    pos_mod = BERTopic.load(TOPIC_POS_REPO)
-    neg_mod = BERTopic.load(TOPIC_NEG_REPO)
+def load_sentiment_model(repo=SENTIMENT_REPO, revision=None):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(repo, revision=revision)
+    sa_mod = AutoModelForSequenceClassification.from_pretrained(repo, revision=revision)
+    sa_mod.eval()
 
     return {
         "tokenizer": tokenizer,
         "sa_mod": sa_mod,
+        "sentiment_repo": repo,
+        # The commit actually loaded, even when the revision was a branch or None
+        "sentiment_revision": getattr(sa_mod.config, "_commit_hash", None),
+    }
+
+
+def load_models(sentiment_repo=SENTIMENT_REPO, pos_repo=TOPIC_POS_REPO,
+                neg_repo=TOPIC_NEG_REPO, sentiment_revision=None, pos_revision=None,
+                neg_revision=None, labels_path=LABELS_PATH,
+                calibration_path=CALIBRATION_PATH, warmup=None):
+    # Thread pools must be set before torch starts any parallel work
+    configure_threads()
+
+    models = load_sentiment_model(sentiment_repo, sentiment_revision)
+
+    pos_mod = _load_topic_model(pos_repo, pos_revision)
+    neg_mod = _load_topic_model(neg_repo, neg_revision)
+
+    models.update({
         "pos_mod": pos_mod,
         "neg_mod": neg_mod,
-    }
\ No newline at end of file
+        "pos_emb_rev": embedding_revision(pos_mod.embedding_model),
+        "neg_emb_rev": embedding_revision(neg_mod.embedding_model),
+        # Topic labels belong to the topic models they were written for
+        "labels": load_topic_labels(labels_path),
+    })
+
+    calibration = load_calibration(calibration_path)
+    if (calibration and calibration.get("model") == sentiment_repo
+            and calibration.get("revision") == models["sentiment_revision"]):
+        models["temperature"] = calibration["temperature"]
+
+    if get_setting("warmup") if warmup is None else warmup:
+        models["warmup"] = warm_up_models(models)
+
+    return models
+
+
+@st.cache_resource
+def load_all_models():
+    return load_models()
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def sort_indexes(df, key):
+    # Argsorts are computed once per result set and reused on every rerun
+    cache_key = f"_sort_{key}"
+    cached = st.session_state.get(cache_key)
+    if cached is None or cached[0] is not df:
+        cached = (df, {})
+        st.session_state[cache_key] = cached
+    return cached[1]
+
+
+def sorted_order(df, column, key):
+    indexes = sort_indexes(df, key)
+    if column not in indexes:
+        indexes[column] = np.argsort(df[column].to_numpy(), kind="stable")
+    return indexes[column]
+
+
+def filter_mask(df, sentiments=None, topics=None, conf_range=None):
+    mask = np.ones(len(df), dtype=bool)
+    if sentiments is not None and "Sentiment" in df.columns:
+        mask &= df["Sentiment"].isin(sentiments).to_numpy()
+    if topics is not None and "Topic" in df.columns:
+        mask &= df["Topic"].isin(topics).to_numpy()
+    if conf_range is not None and "Confidence" in df.columns:
+        conf = df["Confidence"].to_numpy()
+        mask &= (conf >= conf_range[0]) & (conf <= conf_range[1])
+    return mask
+
+
+def paged_dataframe(df, key, page_size=50):
+    sentiments = topics = conf_range = None
+    sort_key = key
+    # Widget keys are tied to the result set so filters reset on a new Run
+    key = f"{key}_{id(df)}"
+
+    cols = st.columns(3)
+    if "Sentiment" in df.columns:
+        options = sorted(df["Sentiment"].unique())
+        sentiments = cols[0].multiselect("Sentimen", options, default=options, key=f"{key}_sent")
+    if "Topic" in df.columns:
+        options = sorted(df["Topic"].unique())
+        topics = cols[1].multiselect("Topik", options, default=options, key=f"{key}_topic")
+    if "Confidence" in df.columns:
+        conf_range = cols[2].slider(
+            "Rentang *confidence*", 0.0, 1.0, (0.0, 1.0), step=0.01, key=f"{key}_conf"
+        )
+
+    cols = st.columns([2, 1, 1, 1])
+    sort_col = cols[0].selectbox("Urutkan berdasarkan", ["(asli)"] + list(df.columns), key=f"{key}_sort")
+    descending = cols[1].toggle("Menurun", key=f"{key}_desc")
+    page_size = cols[2].selectbox(
+        "Baris per halaman", PAGE_SIZES,
+        index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+        key=f"{key}_size"
+    )
+
+    order = np.arange(len(df)) if sort_col == "(asli)" else sorted_order(df, sort_col, sort_key)
+    if descending:
+        order = order[::-1]
+
+    mask = filter_mask(df, sentiments, topics, conf_range)
+    if not mask.all():
+        order = order[mask[order]]
+
+    n_pages = max(1, math.ceil(len(order) / page_size))
+    page = cols[3].number_input("Halaman", 1, n_pages, 1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    view = df.iloc[order[start:start + page_size]]
+
+    st.dataframe(view, use_container_width=True)
+    st.caption(
+        f"Menampilkan {min(start + 1, len(order))}–{start + len(view)} "
+        f"dari {len(order)} baris (total {len(df)})."
+    )
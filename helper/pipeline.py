@@ -0,0 +1,249 @@
+import argparse
+import queue
+import threading
+
+import pandas as pd
+
+from helper.preprocessing import preprocess_batch
+from helper.predict_sentiment import predict_sentiment, encode_texts, classify_inputs
+from helper.predict_topic import predict_topics
+from helper.dedup import dedup_texts, fan_out
+
+_DONE = object()
+
+
+def analyse_reviews(texts, models, token_cache=None, stores=None, fast_model=None,
+                    threshold=0.9, near_duplicates=False, skip_topics=False,
+                    precision=None):
+    stores = stores or {}
+    cleaned_texts = preprocess_batch(texts)
+
+    # --- Deduplication ---
+    unique_texts, inverse = dedup_texts(cleaned_texts, near_duplicates=near_duplicates)
+
+    # --- Sentiment ---
+    uniq_sents, uniq_confs = predict_sentiment(
+        unique_texts, models["tokenizer"], models["sa_mod"],
+        token_cache=token_cache, fast_model=fast_model, threshold=threshold,
+        precision=precision, temperature=models.get("temperature", 1.0)
+    )
+
+    pos_idx = [i for i, sent in enumerate(uniq_sents) if sent == 'Positif']
+    neg_idx = [i for i, sent in enumerate(uniq_sents) if sent != 'Positif']
+
+    # --- Topic ---
+    uniq_topics = None
+    if not skip_topics:
+        uniq_topics = [None] * len(unique_texts)
+        for idx, key in ((pos_idx, "pos"), (neg_idx, "neg")):
+            results = predict_topics(
+                models[f"{key}_mod"], [unique_texts[i] for i in idx], stores.get(key),
+                precision
+            )
+            for i, result in zip(idx, results):
+                uniq_topics[i] = result
+
+    return {
+        "cleaned_texts": cleaned_texts,
+        "unique_texts": unique_texts,
+        "inverse": inverse,
+        "uniq_sents": uniq_sents,
+        "uniq_topics": uniq_topics,
+        "pos_idx": pos_idx,
+        "neg_idx": neg_idx,
+        "sentiments": fan_out(uniq_sents, inverse),
+        "confs": fan_out(uniq_confs, inverse),
+        "topics": fan_out(uniq_topics, inverse) if uniq_topics is not None else None,
+    }
+
+
+# --- Streaming pipeline ---
+# Each stage is a generator over chunks (dicts), so stages compose and only
+# `prefetch_depth` chunks per prefetched stage are ever held in memory.
+
+def chunked(texts, chunk_size):
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            yield {"texts": chunk}
+            chunk = []
+    if chunk:
+        yield {"texts": chunk}
+
+
+def frame_chunks(frames):
+    # DataFrames with a 'Text' column; every other column (e.g. the Row id)
+    # rides along as `meta` and is written back next to the predictions
+    for df in frames:
+        yield {
+            "texts": df["Text"].astype(str).tolist(),
+            "meta": df.drop(columns="Text").reset_index(drop=True)
+        }
+
+
+def prefetch(chunks, depth=1):
+    """Run an upstream generator in a background thread.
+
+    The bounded queue provides backpressure: the producer blocks once it
+    is `depth` chunks ahead of the consumer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                while not stop.is_set():
+                    try:
+                        buffer.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put(_DONE)
+        except BaseException as e:
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def preprocess_stage(chunks):
+    for chunk in chunks:
+        chunk["cleaned"] = preprocess_batch(chunk["texts"])
+        yield chunk
+
+
+def tokenize_stage(chunks, tokenizer, token_cache=None):
+    for chunk in chunks:
+        chunk["inputs"] = encode_texts(chunk["cleaned"], tokenizer, token_cache)
+        yield chunk
+
+
+def classify_stage(chunks, model, precision=None, temperature=1.0):
+    for chunk in chunks:
+        chunk["sentiments"], chunk["confs"] = classify_inputs(
+            chunk.pop("inputs"), model, precision, temperature
+        )
+        yield chunk
+
+
+def topic_stage(chunks, models, stores=None, precision=None):
+    stores = stores or {}
+    for chunk in chunks:
+        topics = [None] * len(chunk["cleaned"])
+        for key, label in (("pos", "Positif"), ("neg", "Negatif")):
+            idx = [i for i, sent in enumerate(chunk["sentiments"]) if sent == label]
+            results = predict_topics(
+                models[f"{key}_mod"], [chunk["cleaned"][i] for i in idx],
+                stores.get(key), precision
+            )
+            for i, result in zip(idx, results):
+                topics[i] = result
+        chunk["topics"] = topics
+        yield chunk
+
+
+def frame_stage(chunks):
+    for chunk in chunks:
+        df = pd.DataFrame({
+            "Text": chunk["texts"],
+            "Sentiment": chunk["sentiments"],
+            "Confidence": chunk["confs"]
+        })
+        if "topics" in chunk:
+            df["Topic"] = [topic for topic, _ in chunk["topics"]]
+            df["Topic Confidence"] = [conf for _, conf in chunk["topics"]]
+        if "meta" in chunk:
+            df = pd.concat([chunk["meta"], df], axis=1)
+        yield df
+
+
+def stream_reviews(texts, models, chunk_size=256, prefetch_depth=2, token_cache=None,
+                   stores=None, precision=None, skip_topics=False):
+    return _run_stages(
+        chunked(texts, chunk_size), models, prefetch_depth, token_cache,
+        stores, precision, skip_topics
+    )
+
+
+def stream_frames(frames, models, prefetch_depth=2, token_cache=None,
+                  stores=None, precision=None, skip_topics=False):
+    return _run_stages(
+        frame_chunks(frames), models, prefetch_depth, token_cache,
+        stores, precision, skip_topics
+    )
+
+
+def _run_stages(chunks, models, prefetch_depth, token_cache, stores, precision, skip_topics):
+    # preprocess -> tokenize run one chunk ahead in a worker thread, so
+    # cleaning chunk N+1 overlaps with the forward passes of chunk N.
+    chunks = tokenize_stage(
+        preprocess_stage(chunks),
+        models["tokenizer"], token_cache
+    )
+    chunks = prefetch(chunks, prefetch_depth)
+    chunks = classify_stage(
+        chunks, models["sa_mod"], precision, models.get("temperature", 1.0)
+    )
+    if not skip_topics:
+        chunks = topic_stage(chunks, models, stores, precision)
+    return frame_stage(chunks)
+
+
+def csv_sink(frames, path):
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, df in enumerate(frames):
+            df.to_csv(f, index=False, header=(i == 0))
+            rows += len(df)
+    return rows
+
+
+def _read_frames(path, chunk_size):
+    # Same Row ids as helper.batch: the 0-based position in the input, so
+    # rows without text are skipped but the rest still join back to it
+    start = 0
+    for df in pd.read_csv(path, chunksize=chunk_size):
+        if "Text" not in df.columns:
+            raise ValueError("input CSV must have a 'Text' column")
+        df.insert(0, "Row", range(start, start + len(df)))
+        start += len(df)
+        df = df[df["Text"].notna()]
+        if len(df):
+            yield df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a review CSV through the pipeline")
+    parser.add_argument("input", help="CSV file with a 'Text' column")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--prefetch", type=int, default=2)
+    parser.add_argument("--skip-topics", action="store_true")
+    args = parser.parse_args()
+
+    from helper.model_loader import load_all_models
+    models = load_all_models()
+
+    frames = stream_frames(
+        _read_frames(args.input, args.chunk_size), models,
+        prefetch_depth=args.prefetch, skip_topics=args.skip_topics
+    )
+    print(f"{csv_sink(frames, args.output)} reviews written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,64 @@
-import torch
+import numpy as np
 import streamlit as st
+from helper.runtime import inference_context
 
 LABEL_MAP = {
     "LABEL_0": "Negatif",
     "LABEL_1": "Positif"
 }
 
-def predict_sentiment(texts, tokenizer, model):
-    inputs = tokenizer(
+def encode_texts(texts, tokenizer, token_cache=None):
+    if token_cache is not None:
+        return token_cache.encode(texts, tokenizer)
+    return tokenizer(
         texts,
         return_tensors='pt',
         padding=True,
         truncation=True
     )
 
-    with torch.no_grad():
+def classify_inputs(inputs, model, precision=None, temperature=1.0):
+    import torch
+
+    with inference_context(precision):
         outputs = model(**inputs)
 
-    probs = torch.softmax(outputs.logits, dim=1)
+    # Temperature scaling is folded into the softmax of the same batch
+    probs = torch.softmax(outputs.logits.float() / temperature, dim=1)
     confs, preds = torch.max(probs, dim=1)
 
     sentiments = [
         LABEL_MAP[model.config.id2label[p.item()]] for p in preds
     ]
 
-    return sentiments, confs.numpy()
\ No newline at end of file
+    return sentiments, confs.numpy()
+
+def _predict_transformer(texts, tokenizer, model, token_cache=None, precision=None,
+                         temperature=1.0):
+    inputs = encode_texts(texts, tokenizer, token_cache)
+    return classify_inputs(inputs, model, precision, temperature)
+
+def predict_sentiment(texts, tokenizer, model, token_cache=None,
+                      fast_model=None, threshold=0.9, precision=None, temperature=1.0):
+    if fast_model is None:
+        return _predict_transformer(texts, tokenizer, model, token_cache, precision, temperature)
+
+    # Cascade: keep confident fast-model predictions, send the rest to IndoBERT
+    probs = fast_model.predict_proba(texts)
+    best = probs.argmax(axis=1)
+    classes = fast_model.classes_
+
+    sentiments = [str(classes[b]) for b in best]
+    confs = probs.max(axis=1).astype(np.float32)
+
+    uncertain = np.flatnonzero(confs < threshold)
+    if len(uncertain):
+        slow_sents, slow_confs = _predict_transformer(
+            [texts[i] for i in uncertain], tokenizer, model, token_cache, precision,
+            temperature
+        )
+        for i, sent in zip(uncertain, slow_sents):
+            sentiments[i] = sent
+        confs[uncertain] = slow_confs
+
+    return sentiments, confs
@@ -1,16 +1,50 @@
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 import streamlit as st
+from helper.runtime import inference_context, resolve_precision
 
-def predict_topic(topic_model, text):
-    text = f"passage: {text}"  # E5 best practice
-    topic_id, _ = topic_model.transform([text])
-    topic_id = topic_id[0]
+def _passages(texts):
+    return [f"passage: {t}" for t in texts]  # E5 best practice
 
-    if topic_id == -1:
-        return -1, 0.0
+def _embed(topic_model, texts, precision=None):
+    with inference_context(precision):
+        embs = topic_model.embedding_model.embed(_passages(texts))
+    return np.asarray(embs, dtype=np.float32)
 
-    emb = topic_model.embedding_model.embed([text])
-    topic_emb = topic_model.topic_embeddings_[topic_id].reshape(1, -1)
-    conf = cosine_similarity(emb, topic_emb)[0][0]
+def embed_texts(topic_model, texts, store=None, precision=None):
+    if store is None:
+        return _embed(topic_model, texts, precision)
 
-    return topic_id, float(conf)
\ No newline at end of file
+    precision = resolve_precision(precision)
+    if store.precision != precision:
+        raise ValueError(f"embedding store holds {store.precision} vectors, not {precision}")
+
+    embs, missing = store.get_many(texts)
+    if missing:
+        new_embs = _embed(topic_model, [texts[i] for i in missing], precision)
+        store.add_many([texts[i] for i in missing], new_embs)
+        if embs is None:
+            embs = np.empty((len(texts), new_embs.shape[1]), dtype=np.float32)
+        embs[missing] = new_embs
+
+    return embs
+
+def predict_topics(topic_model, texts, store=None, precision=None):
+    if not texts:
+        return []
+
+    embs = embed_texts(topic_model, texts, store, precision)
+    topic_ids, _ = topic_model.transform(_passages(texts), embeddings=embs)
+    topic_ids = np.asarray(topic_ids)
+
+    topic_embs = topic_model.topic_embeddings_[np.maximum(topic_ids, 0)]
+    sims = np.einsum("ij,ij->i", embs, topic_embs) / (
+        np.linalg.norm(embs, axis=1) * np.linalg.norm(topic_embs, axis=1)
+    )
+
+    return [
+        (-1, 0.0) if topic_id == -1 else (int(topic_id), float(sim))
+        for topic_id, sim in zip(topic_ids, sims)
+    ]
+
+def predict_topic(topic_model, text, store=None, precision=None):
+    return predict_topics(topic_model, [text], store, precision)[0]
@@ -1,19 +1,28 @@
+import functools
 import re
 import unicodedata
-from unidecode import unidecode
-from indoNLP.preprocessing import replace_slang, replace_word_elongation, emoji_to_words
+
+@functools.lru_cache(maxsize=None)
+def _text_libs():
+    # indoNLP and unidecode are only imported once the first text is cleaned
+    from indoNLP import preprocessing
+    from unidecode import unidecode
+    return preprocessing, unidecode
 
 def emoji_alias(text):
-    text = emoji_to_words(text, delimiter = (" ", " "))
+    indo, _ = _text_libs()
+    text = indo.emoji_to_words(text, delimiter = (" ", " "))
     return " ".join(word.replace("_", " ") for word in text.split())
 
 def clean_text(text: str) -> str:
     if not isinstance(text, str):
         return text
-    
+
+    indo, unidecode = _text_libs()
+
     text = text.lower()
-    text = replace_slang(text)
-    text = replace_word_elongation(text)
+    text = indo.replace_slang(text)
+    text = indo.replace_word_elongation(text)
     text = emoji_alias(text)
     text = unidecode(text)
     text = unicodedata.normalize("NFKC", text)
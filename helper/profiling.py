@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from helper.runtime import get_setting
+
+PROFILE_DIR = 'profiles'
+
+# torch.profiler is process-wide, so only one Run may be profiled at a time
+_active = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def profiling_enabled():
+    if get_setting("profile", False):
+        return True
+    return st.query_params.get("profile") in ("1", "true")
+
+
+class SamplingProfiler:
+    """Samples the Python stack of one thread and writes speedscope JSON."""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.frames = []
+        self._frame_index = {}
+        self.samples = []
+        self.weights = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _frame_id(self, code, lineno):
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self._frame_index:
+            self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return self._frame_index[key]
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code, frame.f_lineno))
+                frame = frame.f_back
+            stack.reverse()
+
+            self.samples.append(stack)
+            self.weights.append(now - last)
+            last = now
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def speedscope(self, name):
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": self.samples,
+                "weights": self.weights
+            }],
+            "name": name,
+            "exporter": "helper.profiling"
+        }
+
+
+class RunProfiler:
+    """Wraps one Run in the sampling profiler and torch's operator profiler.
+
+    Use as a context manager: on a clean exit the report is written and
+    kept in `report`; if the block raises (including Streamlit's rerun and
+    stop exceptions) both profilers are torn down and nothing is written.
+    """
+
+    def __init__(self, out_dir=None):
+        self.out_dir = out_dir or get_setting("profile_dir", PROFILE_DIR)
+        self.name = time.strftime("run_%Y%m%d_%H%M%S")
+        self.sampler = SamplingProfiler()
+        self.torch_prof = None
+        self.report = None
+        self._running = False
+
+    def start(self):
+        if not _active.acquire(blocking=False):
+            raise ProfilerBusy("another Run is already being profiled")
+        self._running = True
+        try:
+            import torch
+
+            self.torch_prof = torch.profiler.profile(
+                activities=[torch.profiler.ProfilerActivity.CPU]
+            )
+            self.torch_prof.__enter__()
+            self.sampler.start()
+        except BaseException:
+            self._teardown()
+            raise
+        return self
+
+    def __enter__(self):
+        return self if self._running else self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.report = self.stop()
+        else:
+            self._teardown()
+        return False
+
+    def _teardown(self):
+        if not self._running:
+            return
+        self._running = False
+        try:
+            if self.sampler._thread is not None:
+                self.sampler.stop()
+            if self.torch_prof is not None:
+                self.torch_prof.__exit__(None, None, None)
+        finally:
+            _active.release()
+
+    def stop(self):
+        self._teardown()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        speedscope_path = os.path.join(self.out_dir, f"{self.name}.speedscope.json")
+        torch_path = os.path.join(self.out_dir, f"{self.name}_torch_ops.txt")
+
+        speedscope = json.dumps(self.sampler.speedscope(self.name))
+        torch_table = self.torch_prof.key_averages().table(
+            sort_by="cpu_time_total", row_limit=50
+        )
+
+        with open(speedscope_path, "w", encoding="utf-8") as f:
+            f.write(speedscope)
+        with open(torch_path, "w", encoding="utf-8") as f:
+            f.write(torch_table)
+
+        return {
+            "name": self.name,
+            "duration": self.sampler.duration,
+            "samples": len(self.sampler.samples),
+            "speedscope_path": speedscope_path,
+            "speedscope": speedscope,
+            "torch_path": torch_path,
+            "torch_table": torch_table
+        }
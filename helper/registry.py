@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from helper.runtime import get_setting
+
+MANIFEST_PATH = 'data/model_manifest.json'
+DEFAULT_VERSION = "default"
+
+
+class ModelRegistry:
+    """Versioned model sets with background loading and atomic switching.
+
+    New requests always get the active version; a request pins the version
+    it started with until it finishes. Inactive versions are dropped as
+    soon as no request holds them.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._versions = {}
+        self._refs = {}
+        self._active = None
+        self._loading = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def register(self, version, models):
+        with self._lock:
+            self._versions[version] = models
+            self._refs.setdefault(version, 0)
+            self._active = version
+            self._evict_idle()
+
+    def current(self):
+        with self._lock:
+            return self._active, self._versions[self._active]
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            version = self._active
+            self._refs[version] += 1
+            models = self._versions[version]
+        try:
+            yield version, models
+        finally:
+            with self._lock:
+                self._refs[version] -= 1
+                self._evict_idle()
+
+    def _evict_idle(self):
+        for version in list(self._versions):
+            if version != self._active and self._refs[version] == 0:
+                del self._versions[version]
+                del self._refs[version]
+
+    def activate(self, version):
+        """Switch to a version that is still loaded (e.g. a rollback while
+        an old Run holds it); returns False if it has to be loaded first."""
+        with self._lock:
+            if version not in self._versions:
+                return False
+            self._active = version
+            self._evict_idle()
+            return True
+
+    def set_error(self, message):
+        with self._lock:
+            self._error = message
+
+    def load_in_background(self, version, **repos):
+        with self._lock:
+            if self._loading is not None or version in self._versions:
+                return False
+            self._loading = version
+            self._error = None
+
+        def load():
+            try:
+                # load_models warms the new version before it is registered
+                models = self._loader(warmup=True, **repos)
+                self.register(version, models)
+            except Exception as e:
+                with self._lock:
+                    self._error = f"{version}: {e}"
+            finally:
+                with self._lock:
+                    self._loading = None
+
+        threading.Thread(target=load, daemon=True).start()
+        return True
+
+    def status(self):
+        with self._lock:
+            return {
+                "active": self._active,
+                "loaded": {v: self._refs[v] for v in self._versions},
+                "loading": self._loading,
+                "error": self._error
+            }
+
+
+MANIFEST_KEYS = {
+    "sentiment": "sentiment_repo",
+    "sentiment_revision": "sentiment_revision",
+    "topic_pos": "pos_repo",
+    "topic_pos_revision": "pos_revision",
+    "topic_neg": "neg_repo",
+    "topic_neg_revision": "neg_revision",
+    "labels": "labels_path",
+    "calibration": "calibration_path",
+}
+
+
+def read_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    repos = {key: manifest[name] for name, key in MANIFEST_KEYS.items() if name in manifest}
+    return manifest["version"], repos
+
+
+class ManifestWatcher:
+    """Triggers a hot swap when the model manifest file changes.
+
+    The manifest is JSON such as
+    {"version": "2026-10", "sentiment": "...", "topic_pos": "...", "topic_neg": "...",
+     "labels": "data/data.xlsx", "calibration": "data/sentiment_calibration.json"}
+    where each model may also be pinned to a Hub commit, branch or tag with
+    "sentiment_revision", "topic_pos_revision" or "topic_neg_revision".
+    A manifest that cannot be read is reported through the registry status
+    and read again on the next poll. The version it names stays pending
+    until the registry accepts it, so a change made while another version
+    is still loading is applied once that load finishes.
+    """
+
+    def __init__(self, registry, path, interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._last_check = 0.0
+        self._last_mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_check < self.interval:
+                return
+            self._last_check = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except FileNotFoundError:
+                mtime = self._last_mtime
+
+            if mtime != self._last_mtime:
+                try:
+                    self._pending = read_manifest(self.path)
+                except (OSError, ValueError, KeyError) as e:
+                    # Possibly caught mid-write; mtime is not recorded so it is retried
+                    self.registry.set_error(f"manifest {self.path}: {e!r}")
+                    return
+                self._last_mtime = mtime
+
+            if self._pending is None:
+                return
+            version, repos = self._pending
+            if (version == self.registry.status()["active"]
+                    or self.registry.activate(version)
+                    or self.registry.load_in_background(version, **repos)):
+                self._pending = None
+            # Otherwise another version is still loading: retry on the next poll
+
+
+@st.cache_resource
+def get_model_registry():
+    # Uncached loader, so an evicted version can actually be freed
+    from helper.model_loader import load_models
+
+    registry = ModelRegistry(load_models)
+    path = get_setting("model_manifest", MANIFEST_PATH)
+    if os.path.exists(path):
+        version, repos = read_manifest(path)
+        registry.register(version, load_models(**repos))
+    else:
+        registry.register(DEFAULT_VERSION, load_models())
+    return registry
+
+
+@st.cache_resource
+def get_manifest_watcher():
+    return ManifestWatcher(
+        get_model_registry(),
+        get_setting("model_manifest", MANIFEST_PATH),
+        get_setting("model_manifest_interval", 10.0)
+    )
@@ -0,0 +1,117 @@
+import contextlib
+import os
+
+CPU_COUNT = os.cpu_count() or 1
+
+# Every knob is read from a JKT_* environment variable so one deployment
+# setting controls all thread pools (torch, tokenizers, BLAS, numba).
+DEFAULTS = {
+    "max_sessions": 2,
+    "intra_op_threads": None,
+    "inter_op_threads": 1,
+    "tokenizers_parallelism": False,
+    "numba_cache_dir": ".numba_cache",
+    "warmup": True,
+    "precision": "fp32",
+}
+
+PRECISIONS = ("fp32", "bf16")
+
+_configured = False
+
+
+def get_setting(name, default=None):
+    raw = os.environ.get(f"JKT_{name.upper()}")
+    if default is None:
+        default = DEFAULTS.get(name)
+    if raw is None or raw == "":
+        return default
+    if isinstance(default, bool):
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    return raw
+
+
+def thread_settings():
+    sessions = max(1, get_setting("max_sessions"))
+    intra = get_setting("intra_op_threads", max(1, CPU_COUNT // sessions))
+    return {
+        "intra_op_threads": intra,
+        "inter_op_threads": get_setting("inter_op_threads"),
+        "tokenizers_parallelism": get_setting("tokenizers_parallelism"),
+    }
+
+
+def configure_threads():
+    """Apply thread settings; call before torch/numba do any parallel work."""
+    global _configured
+    if _configured:
+        return thread_settings()
+
+    settings = thread_settings()
+    n = str(settings["intra_op_threads"])
+
+    # Read by the native libraries at import time
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMBA_NUM_THREADS"):
+        os.environ[var] = n
+    os.environ["TOKENIZERS_PARALLELISM"] = "true" if settings["tokenizers_parallelism"] else "false"
+    # Lets UMAP/pynndescent reuse compiled kernels across restarts
+    os.environ.setdefault("NUMBA_CACHE_DIR", get_setting("numba_cache_dir"))
+
+    import torch
+    torch.set_num_threads(settings["intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(settings["inter_op_threads"])
+    except RuntimeError:
+        # Already fixed once inter-op work has started in this process
+        pass
+
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=settings["intra_op_threads"])
+
+    _configured = True
+    return settings
+
+
+def set_intra_op_threads(n):
+    """Set torch, BLAS and numba pools to `n` threads; returns the counts in effect.
+
+    numba cannot exceed the NUMBA_NUM_THREADS ceiling fixed by
+    configure_threads(), so its count may be lower than `n`.
+    """
+    import torch
+    from threadpoolctl import threadpool_limits
+
+    torch.set_num_threads(n)
+    threadpool_limits(limits=n)
+    effective = {"torch": torch.get_num_threads(), "numba": None}
+    try:
+        import numba
+        numba.set_num_threads(min(n, numba.config.NUMBA_NUM_THREADS))
+        effective["numba"] = numba.get_num_threads()
+    except ImportError:
+        pass
+    return effective
+
+
+def resolve_precision(precision=None):
+    precision = precision or get_setting("precision")
+    if precision not in PRECISIONS:
+        raise ValueError(f"unknown precision '{precision}', expected one of {PRECISIONS}")
+    return precision
+
+
+@contextlib.contextmanager
+def inference_context(precision=None):
+    import torch
+
+    precision = resolve_precision(precision)
+    with torch.inference_mode():
+        if precision == "bf16":
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                yield
+        else:
+            yield
@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+class ReviewIndex:
+    """Brute-force cosine index over analysed reviews, grown incrementally."""
+
+    def __init__(self):
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._seen = set()
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, rows, dim):
+        if self._vectors.shape[0] >= rows:
+            return
+        capacity = max(rows, self._vectors.shape[0] * 2, 256)
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        if self._size:
+            grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+
+    def add(self, embs, records, keys):
+        embs = np.asarray(embs, dtype=np.float32)
+        with self._lock:
+            keep = [i for i, key in enumerate(keys) if key not in self._seen]
+            if not keep:
+                return
+
+            vecs = embs[keep]
+            vecs /= np.linalg.norm(vecs, axis=1, keepdims=True) + 1e-12
+
+            self._reserve(self._size + len(keep), vecs.shape[1])
+            self._vectors[self._size:self._size + len(keep)] = vecs
+            self._size += len(keep)
+            for i in keep:
+                self._seen.add(keys[i])
+                self.records.append(records[i])
+
+    def search(self, query_emb, k=10):
+        with self._lock:
+            if not self._size:
+                return pd.DataFrame()
+
+            query = np.asarray(query_emb, dtype=np.float32).reshape(-1)
+            query /= np.linalg.norm(query) + 1e-12
+            sims = self._vectors[:self._size] @ query
+
+            k = min(k, self._size)
+            top = np.argpartition(-sims, k - 1)[:k]
+            top = top[np.argsort(-sims[top])]
+
+            df = pd.DataFrame([self.records[i] for i in top])
+            df.insert(0, "Similarity", sims[top])
+            return df
+
+
+class ReviewIndexSet:
+    """One ReviewIndex per embedding revision.
+
+    Positive and negative reviews are embedded by different topic models,
+    and vectors from different embedders are not comparable, so each
+    revision gets its own index and is queried with its own embedder.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(index) for index in self._indexes.values())
+
+    def revisions(self):
+        with self._lock:
+            return [revision for revision, index in self._indexes.items() if len(index)]
+
+    def add(self, revision, embs, records, keys):
+        with self._lock:
+            index = self._indexes.setdefault(revision, ReviewIndex())
+        index.add(embs, records, keys)
+
+    def search(self, embedders, query, k=10):
+        """Search every index whose revision is in `embedders` (revision -> topic model)."""
+        with self._lock:
+            indexes = [
+                (embedders[revision], index)
+                for revision, index in self._indexes.items()
+                if revision in embedders
+            ]
+        frames = [
+            index.search(embed_query(topic_model, query), k)
+            for topic_model, index in indexes
+            if len(index)
+        ]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values("Similarity", ascending=False).head(k).reset_index(drop=True)
+
+
+def embed_query(topic_model, query):
+    return np.asarray(topic_model.embedding_model.embed([f"query: {query}"]))[0]  # E5 best practice
+
+
+@st.cache_resource
+def get_archive_index():
+    return ReviewIndexSet()
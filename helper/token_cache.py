@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from helper.runtime import get_setting
+
+
+class TokenCache:
+    """LRU cache of tokenized texts, bounded by the total number of tokens.
+
+    Only `input_ids` are stored (as int32); the attention mask of an
+    unpadded sequence is all ones and is rebuilt when a batch is padded.
+    """
+
+    def __init__(self, max_tokens):
+        self.max_tokens = max_tokens
+        self.total_tokens = 0
+        self.hits = 0
+        self.misses = 0
+        self.tokenize_seconds = 0.0
+        self.tokens_tokenized = 0
+        self.tokens_reused = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _lookup(self, key):
+        ids = self._entries.get(key)
+        if ids is not None:
+            self._entries.move_to_end(key)
+        return ids
+
+    def _store(self, key, ids):
+        if key in self._entries:
+            return
+        self._entries[key] = ids
+        self.total_tokens += len(ids)
+        while self.total_tokens > self.max_tokens and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_tokens -= len(evicted)
+
+    def encode(self, texts, tokenizer):
+        name = tokenizer.name_or_path
+        sequences = [None] * len(texts)
+        missing = {}
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                ids = self._lookup((name, text))
+                if ids is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    sequences[i] = ids
+                    self.hits += 1
+                    self.tokens_reused += len(ids)
+                    run = getattr(self._local, "run", None)
+                    if run is not None:
+                        run["hits"] += 1
+                        run["tokens_reused"] += len(ids)
+
+        if missing:
+            start = time.perf_counter()
+            encoded = tokenizer(list(missing), truncation=True)["input_ids"]
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.tokenize_seconds += elapsed
+                for text, ids in zip(missing, encoded):
+                    ids = np.asarray(ids, dtype=np.int32)
+                    self._store((name, text), ids)
+                    self.misses += 1
+                    self.tokens_tokenized += len(ids)
+                    for i in missing[text]:
+                        sequences[i] = ids
+
+        return pad_batch(sequences, tokenizer.pad_token_id or 0)
+
+    def saved_seconds(self, tokens_reused=None):
+        if not self.tokens_tokenized:
+            return 0.0
+        if tokens_reused is None:
+            tokens_reused = self.tokens_reused
+        return self.tokenize_seconds / self.tokens_tokenized * tokens_reused
+
+    @contextmanager
+    def track(self):
+        """Count the hits of one Run; the cache itself is shared by all sessions.
+
+        Counters are thread-local, so concurrent sessions do not leak into
+        each other's report.
+        """
+        run = {"hits": 0, "tokens_reused": 0}
+        self._local.run = run
+        try:
+            yield run
+        finally:
+            self._local.run = None
+            run["saved_seconds"] = self.saved_seconds(run["tokens_reused"])
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "total_tokens": self.total_tokens,
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_seconds": self.saved_seconds()
+        }
+
+
+def pad_batch(sequences, pad_token_id):
+    import torch
+
+    max_len = max((len(s) for s in sequences), default=0)
+    input_ids = np.full((len(sequences), max_len), pad_token_id, dtype=np.int32)
+    attention_mask = np.zeros((len(sequences), max_len), dtype=np.int32)
+
+    for i, ids in enumerate(sequences):
+        input_ids[i, :len(ids)] = ids
+        attention_mask[i, :len(ids)] = 1
+
+    return {
+        "input_ids": torch.from_numpy(input_ids).long(),
+        "attention_mask": torch.from_numpy(attention_mask).long()
+    }
+
+
+@st.cache_resource
+def get_token_cache():
+    return TokenCache(get_setting("token_cache_max_tokens", 2_000_000))
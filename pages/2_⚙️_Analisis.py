@@ -1,30 +1,40 @@
 import streamlit as st 
 import pandas as pd
-import matplotlib.pyplot as plt
+import contextlib
+import os
 from data.sample_texts import SAMPLE_TEXTS
 from helper.preprocessing import preprocess_batch
-from helper.predict_sentiment import predict_sentiment
-from helper.predict_topic import predict_topic
-from helper.charts import sentiment_bar_chart, topic_bar_chart
-from helper.interpret import topic_interpretation, compute_sentiment_metrics, sentiment_interpretation
+from helper.predict_topic import embed_texts
+from helper.pipeline import analyse_reviews
+from helper.charts import sentiment_bar_chart, topic_bar_chart, close_chart
+from helper.interpret import topic_interpretation, compute_sentiment_metrics, sentiment_interpretation, format_topic_label
 from helper.download import download_csv
-
-# --- Label Map ---
-STAT_FILE_PATH = 'data/data.xlsx'
-
-pos_lab = pd.read_excel(STAT_FILE_PATH, sheet_name="pos_lab")
-neg_lab = pd.read_excel(STAT_FILE_PATH, sheet_name="neg_lab")
-
-pos_label_map = dict(zip(pos_lab["Topic"], pos_lab["Label"]))
-neg_label_map = dict(zip(neg_lab["Topic"], neg_lab["Label"]))
+from helper.dedup import dedup_report
+from helper.token_cache import get_token_cache
+from helper.fast_sentiment import load_fast_model
+from helper.embedding_store import get_embedding_store, text_key
+from helper.search import ReviewIndexSet, get_archive_index
+from helper.aggregate import META_COLUMNS, FREQ_MAP, aggregate_sentiment, aggregate_topics
+from helper.admission import (
+    DEGRADE_MODES, AdmissionError, admission_limits, plan_job,
+    sample_indices, submit_batch_job, get_admission_controller
+)
+from helper.paging import paged_dataframe
+from helper.profiling import ProfilerBusy, RunProfiler, profiling_enabled
+from helper.registry import get_model_registry, get_manifest_watcher
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # --- Get Models ---
-models = st.session_state.models
+registry = get_model_registry()
+get_manifest_watcher().poll()
+model_version, models = registry.current()
+
+token_cache = get_token_cache()
+fast_model = load_fast_model()
 
-tokenizer = models["tokenizer"]
-sa_mod = models["sa_mod"]
-pos_mod = models["pos_mod"]
-neg_mod = models["neg_mod"]
+limits = admission_limits()
+controller = get_admission_controller()
+session_id = get_script_run_ctx().session_id
 
 # --- INTERFACE ---
 # --- Page Config ---
@@ -43,8 +53,29 @@ if "df_pos" not in st.session_state:
 if "df_neg" not in st.session_state:
     st.session_state.df_neg = None
 
-if "cleaned_texts" not in st.session_state:
-    st.session_state.cleaned_texts = None
+if "df_clean" not in st.session_state:
+    st.session_state.df_clean = None
+
+if "dedup_report" not in st.session_state:
+    st.session_state.dedup_report = None
+
+if "token_report" not in st.session_state:
+    st.session_state.token_report = None
+
+if "df_reviews" not in st.session_state:
+    st.session_state.df_reviews = None
+
+if "profile_report" not in st.session_state:
+    st.session_state.profile_report = None
+
+if "calibrated" not in st.session_state:
+    st.session_state.calibrated = False
+
+if "topic_labels" not in st.session_state:
+    st.session_state.topic_labels = None
+
+if "review_index" not in st.session_state:
+    st.session_state.review_index = ReviewIndexSet()
 
 
 # --- Brief Explanation ---
@@ -60,6 +91,7 @@ input_mode = st.radio(
 )
 
 texts = []
+df_meta = None
 
 if input_mode == 'Ketik Teks':
     text_input = st.text_area(
@@ -71,7 +103,7 @@ if input_mode == 'Ketik Teks':
 
 elif input_mode == "Unggah CSV":
     up_file = st.file_uploader(
-        "Unggah file CSV (harus memiliki kolom bernama 'Text')",
+        "Unggah file CSV (harus memiliki kolom bernama 'Text'; kolom 'Application' dan 'Date' opsional)",
         type=["csv"]
     )
     if up_file:
@@ -79,7 +111,11 @@ elif input_mode == "Unggah CSV":
         if "Text" not in df_input.columns:
             st.error("File CSV harus memiliki kolom bernama 'Text'")
         else:
-            texts = df_input["Text"].dropna().astype(str).tolist()
+            df_input = df_input[df_input["Text"].notna()]
+            texts = df_input["Text"].astype(str).tolist()
+            meta_cols = [c for c in META_COLUMNS if c in df_input.columns]
+            if meta_cols:
+                df_meta = df_input[meta_cols].reset_index(drop=True)
 
 elif input_mode == "Teks Contoh":
     st.info("Menggunakan teks contoh bawaan.")
@@ -90,123 +126,332 @@ elif input_mode == "Teks Contoh":
 
 # --- Run Analysis ---
 with st.form("analysis_form", border=False):
+    near_dup = st.checkbox(
+        "Gabungkan ulasan yang hampir sama sebelum inferensi",
+        value=False
+    )
+    use_cascade = False
+    cascade_threshold = 0.9
+    if fast_model is not None:
+        use_cascade = st.checkbox(
+            "Mode cepat: klasifikasi awal dengan model ringan, hanya ulasan ragu yang diproses IndoBERT",
+            value=False
+        )
+        cascade_threshold = st.slider(
+            "Ambang *confidence* model ringan",
+            min_value=0.5, max_value=0.99, value=0.9, step=0.01
+        )
+
+    degrade_mode = limits["degrade_mode"]
+    if len(texts) > limits["max_rows"] or plan_job(texts, limits=limits)["action"] != "accept":
+        st.warning(
+            f"Data melebihi batas analisis interaktif "
+            f"(maks. {limits['max_rows']} ulasan). Pilih cara penanganannya:"
+        )
+        modes = list(DEGRADE_MODES)
+        degrade_mode = st.selectbox(
+            "Penanganan data besar",
+            modes,
+            index=modes.index(degrade_mode),
+            format_func=DEGRADE_MODES.get
+        )
     run_clicked = st.form_submit_button("🚀 Run")
 
-if run_clicked and texts:
-    cleaned_texts = preprocess_batch(texts)
+depth = controller.queue_depth()
+st.caption(f"🕒 Antrean analisis: {depth['running']} berjalan, {depth['waiting']} menunggu.")
+
+registry_status = registry.status()
+st.sidebar.caption(f"🧠 Versi model aktif: `{registry_status['active']}`")
+if registry_status["loading"]:
+    st.sidebar.caption(f"⏳ Memuat versi model `{registry_status['loading']}` di latar belakang.")
+if registry_status["error"]:
+    st.sidebar.error(f"Gagal memuat versi model {registry_status['error']}")
+
+plan = plan_job(texts, degrade_mode, limits) if run_clicked and texts else None
+
+if plan and plan["action"] == "reject":
+    st.error("Data terlalu besar untuk dianalisis secara interaktif.")
+    plan = None
+
+elif plan and plan["action"] == "batch":
+    path = submit_batch_job(texts, df_meta)
+    # Nothing watches the inbox: an operator runs the batch CLI on it
+    stem = os.path.splitext(path)[0]
+    st.info(
+        f"Data disimpan sebagai batch job di `{path}`. Job ini tidak diproses otomatis; "
+        f"jalankan secara manual:\n\n"
+        f"`python -m helper.batch run {path} {stem}_hasil.csv --workdir {stem}`"
+    )
+    plan = None
+
+elif plan and plan["sample_size"]:
+    keep = sample_indices(len(texts), plan["sample_size"])
+    texts = [texts[i] for i in keep]
+    if df_meta is not None:
+        df_meta = df_meta.iloc[keep].reset_index(drop=True)
+    if plan["skip_topics"]:
+        st.info(
+            f"Data besar: pemodelan topik dilewati dan, karena masih melebihi batas, "
+            f"dianalisis sampel acak {len(texts)} ulasan."
+        )
+    else:
+        st.info(f"Data besar: dianalisis sampel acak {len(texts)} ulasan.")
+
+elif plan and plan["skip_topics"]:
+    st.info("Data besar: pemodelan topik dilewati.")
+
+# --- Profiling (?profile=1 or JKT_PROFILE=1) ---
+# The profile starts once the Run is admitted (queue waiting is not
+# sampled) and ends after the topic charts, so rendering is attributed
+# too. Any exception, including a rerun or st.stop(), tears it down
+# without writing a report.
+profiler = None
+with contextlib.ExitStack() as profile_scope:
+    if plan:
+        try:
+            # The Run stays on the model version it started with even if a
+            # newer version is activated meanwhile
+            with controller.admit(session_id, limits["queue_timeout"]), \
+                    registry.acquire() as (model_version, run_models), \
+                    token_cache.track() as token_run:
+                if profiling_enabled():
+                    try:
+                        profiler = profile_scope.enter_context(RunProfiler())
+                    except ProfilerBusy:
+                        st.warning("Run lain sedang diprofil; Run ini berjalan tanpa profil.")
+
+                result = analyse_reviews(
+                    texts, run_models,
+                    token_cache=token_cache,
+                    stores={
+                        "pos": get_embedding_store(run_models["pos_emb_rev"]),
+                        "neg": get_embedding_store(run_models["neg_emb_rev"])
+                    },
+                    fast_model=fast_model if use_cascade else None,
+                    threshold=cascade_threshold,
+                    near_duplicates=near_dup,
+                    skip_topics=plan["skip_topics"]
+                )
+
+                # Everything derived from the models stays on the pinned version
+                run_labels = run_models["labels"]
+                # Fast-model confidences in the cascade are not temperature scaled
+                run_calibrated = "temperature" in run_models and not use_cascade
+
+                if result["topics"] is not None:
+                    # --- Similar-review index ---
+                    first_text = {}
+                    for text, u in zip(texts, result["inverse"]):
+                        first_text.setdefault(u, text)
+
+                    for side in ("pos", "neg"):
+                        idx = result[f"{side}_idx"]
+                        if not idx:
+                            continue
+                        revision = run_models[f"{side}_emb_rev"]
+                        embs = embed_texts(
+                            run_models[f"{side}_mod"], [result["unique_texts"][i] for i in idx],
+                            get_embedding_store(revision)
+                        )
+                        records = [{
+                            "Text": first_text[i],
+                            "Sentiment": result["uniq_sents"][i],
+                            "Topic": format_topic_label(result["uniq_topics"][i][0], run_labels[side])
+                        } for i in idx]
+                        keys = [text_key(result["unique_texts"][i]) for i in idx]
+                        st.session_state.review_index.add(revision, embs, records, keys)
+                        get_archive_index().add(revision, embs, records, keys)
+        except AdmissionError as e:
+            st.error(str(e))
+            result = None
+
+        if result is not None:
+            sentiments = result["sentiments"]
+            st.session_state.dedup_report = dedup_report(result["inverse"], len(result["unique_texts"]))
+            st.session_state.token_report = token_run
+            st.session_state.calibrated = run_calibrated
+            st.session_state.topic_labels = run_labels
+
+            df_sent = pd.DataFrame({
+                "Text": texts,
+                "Sentiment": sentiments,
+                "Confidence": result["confs"]
+            })
 
-    # --- Sentiment ---
-    sentiments, confs = predict_sentiment(cleaned_texts, tokenizer, sa_mod)
+            st.session_state.df_sent = df_sent
+            st.session_state.df_clean = pd.DataFrame({
+                "Original Text": texts,
+                "Cleaned Text": result["cleaned_texts"]
+            })
 
-    df_sent = pd.DataFrame({
-        "Text": texts,
-        "Sentiment": sentiments,
-        "Confidence": confs
-    })
+            pos_rows = []
+            neg_rows = []
+
+            if result["topics"] is not None:
+                for text, sent, (topic, conf) in zip(texts, sentiments, result["topics"]):
+                    row = {
+                        "Text": text,
+                        "Topic": topic,
+                        "Confidence": conf
+                    }
+                    if sent == 'Positif':
+                        pos_rows.append(row)
+                    else:
+                        neg_rows.append(row)
+
+            st.session_state.df_pos = pd.DataFrame(pos_rows) if pos_rows else None
+            st.session_state.df_neg = pd.DataFrame(neg_rows) if neg_rows else None
+
+            if df_meta is not None:
+                df_reviews = pd.concat([df_meta, df_sent], axis=1)
+                if result["topics"] is not None:
+                    df_reviews["Topic"] = [topic for topic, _ in result["topics"]]
+                st.session_state.df_reviews = df_reviews
+            else:
+                st.session_state.df_reviews = None
+
+    elif run_clicked and not texts:
+        st.warning("Silakan masukkan teks ulasan atau unggah file CSV terlebih dahulu.")
+
+    # --- Label Map (of the model version that produced the shown results) ---
+    topic_labels = st.session_state.topic_labels or models["labels"]
+    pos_label_map = topic_labels["pos"]
+    neg_label_map = topic_labels["neg"]
+
+    if st.session_state.df_sent is not None:
+
+        with st.expander("🔍 Lihat Hasil Pre-processing"):
+            paged_dataframe(st.session_state.df_clean, "clean")
+
+        report = st.session_state.dedup_report
+        if report and report["saved"]:
+            st.caption(
+                f"♻️ {report['total']} ulasan digabung menjadi {report['unique']} teks unik; "
+                f"inferensi untuk {report['saved']} ulasan ({report['saved_ratio']:.1%}) dilewati."
+            )
 
-    st.session_state.df_sent = df_sent
-    st.session_state.cleaned_texts = cleaned_texts
+        token_report = st.session_state.token_report
+        if token_report and token_report["hits"]:
+            st.caption(
+                f"⚡ Cache tokenisasi: {token_report['hits']} teks digunakan ulang, "
+                f"menghemat ±{token_report['saved_seconds']:.2f} detik tokenisasi."
+            )
 
-    # --- Topic ---
-    pos_rows = []
-    neg_rows = []
+        st.subheader("🚦 Hasil Analisis Sentimen")
 
-    for text, cleaned_text, sent in zip(texts, cleaned_texts, sentiments):
-        if sent == 'Positif':
-            topic, conf = predict_topic(
-                pos_mod, cleaned_text
+        df_sent = st.session_state.df_sent
+        df_pos = st.session_state.df_pos
+        df_neg = st.session_state.df_neg
+
+        metrics = compute_sentiment_metrics(df_sent)
+    
+        st.write(sentiment_interpretation(metrics, calibrated=st.session_state.calibrated))
+     
+        col1, col2, col3 = st.columns([3, 1, 1])
+
+        with col1:
+            sentiment_bar_chart(metrics["counts"])
+        with col2:
+            st.metric("Total Ulasan", metrics["total"])
+            st.metric("Rata-rata *Confidence*", f"{metrics['avg_conf']:.2f}")
+        with col3:
+            st.metric(
+                "Positif",
+                metrics["pos"],
+                f"{metrics['pos']/metrics['total']:.1%}"
             )
-            pos_rows.append({
-                "Text": text,
-                "Topic": topic,
-                "Confidence": conf
-            })
-        else:
-            topic, conf = predict_topic(
-                neg_mod, cleaned_text
+            st.metric(
+                "Negatif",
+                metrics["neg"],
+                f"{metrics['neg']/metrics['total']:.1%}",
+                delta_color="inverse"
             )
-            neg_rows.append({
-                "Text": text,
-                "Topic": topic,
-                "Confidence": conf
-            })
 
-    st.session_state.df_pos = pd.DataFrame(pos_rows) if pos_rows else None
-    st.session_state.df_neg = pd.DataFrame(neg_rows) if neg_rows else None
-    
-elif run_clicked:
-    st.warning("Silakan masukkan teks ulasan atau unggah file CSV terlebih dahulu.")
-
-if st.session_state.df_sent is not None:
-
-    with st.expander("🔍 Lihat Hasil Pre-processing"):
-        st.dataframe(
-            pd.DataFrame({
-                "Original Text": st.session_state.df_sent["Text"],
-                "Cleaned Text": st.session_state.cleaned_texts
-            }),
-            use_container_width=True
+        with st.expander("🔍 Lihat Detail Hasil"):
+            paged_dataframe(st.session_state.df_sent, "sent")
+
+        download_csv(
+            st.session_state.df_sent,
+            "hasil_sentimen.csv",
+            "Hasil Prediksi Sentimen"
         )
 
-    st.subheader("🚦 Hasil Analisis Sentimen")
+        if st.session_state.df_reviews is not None:
+            st.subheader("📅 Agregasi per Aplikasi dan Waktu")
 
-    df_sent = st.session_state.df_sent
-    df_pos = st.session_state.df_pos
-    df_neg = st.session_state.df_neg
+            freq_label = st.radio("Periode:", list(FREQ_MAP), horizontal=True)
+            freq = FREQ_MAP[freq_label]
 
-    metrics = compute_sentiment_metrics(df_sent)
-    
-    st.write(sentiment_interpretation(metrics))
-     
-    col1, col2, col3 = st.columns([3, 1, 1])
-
-    with col1:
-        sentiment_bar_chart(metrics["counts"])
-    with col2:
-        st.metric("Total Ulasan", metrics["total"])
-        st.metric("Rata-rata *Confidence*", f"{metrics['avg_conf']:.2f}")
-    with col3:
-        st.metric(
-            "Positif",
-            metrics["pos"],
-            f"{metrics['pos']/metrics['total']:.1%}"
-        )
-        st.metric(
-            "Negatif",
-            metrics["neg"],
-            f"{metrics['neg']/metrics['total']:.1%}",
-            delta_color="inverse"
-        )
+            df_agg = aggregate_sentiment(st.session_state.df_reviews, freq)
+            df_topic_agg = aggregate_topics(st.session_state.df_reviews, freq)
 
-    with st.expander("🔍 Lihat Detail Hasil"):
-        st.dataframe(
-            st.session_state.df_sent,
-            use_container_width=True
-        )
+            if "Period" in df_agg.columns:
+                share = df_agg.pivot_table(
+                    index="Period",
+                    columns="Application" if "Application" in df_agg.columns else None,
+                    values="Positive_Share"
+                )
+                st.line_chart(share)
+
+            with st.expander("🔍 Lihat Detail Agregasi"):
+                st.dataframe(df_agg, use_container_width=True)
+                st.dataframe(df_topic_agg, use_container_width=True)
+
+            download_csv(df_agg, "agregasi_sentimen.csv", "Agregasi Sentimen")
 
-    download_csv(
-        st.session_state.df_sent,
-        "hasil_sentimen.csv",
-        "Hasil Prediksi Sentimen"
+    has_pos = (
+        st.session_state.df_pos is not None
+        and not st.session_state.df_pos.empty
     )
 
-has_pos = (
-    st.session_state.df_pos is not None
-    and not st.session_state.df_pos.empty
-)
+    has_neg = (
+        st.session_state.df_neg is not None
+        and not st.session_state.df_neg.empty
+    )
 
-has_neg = (
-    st.session_state.df_neg is not None
-    and not st.session_state.df_neg.empty
-)
+    # JIKA POSITIF & NEGATIF ADA
+    if has_pos and has_neg:
+
+        col1, col2 = st.columns(2)
+
+        # ---------- POSITIVE ----------
+        with col1:
+            st.subheader("🟢 Topik Sentimen Positif")
+
+            df_pos = st.session_state.df_pos
+            topic_pos_counts = df_pos["Topic"].value_counts()
+
+            fig = topic_bar_chart(topic_pos_counts, "Distribusi Topik Positif")
+            st.pyplot(fig)
+            close_chart(fig)
+
+            st.markdown("**📌 Interpretasi Topik Positif:**")
+            st.write(topic_interpretation(topic_pos_counts, pos_label_map, "positif"))
 
-# JIKA POSITIF & NEGATIF ADA
-if has_pos and has_neg:
+            with st.expander("🔍 Lihat Detail"):
+                paged_dataframe(df_pos, "pos")
 
-    col1, col2 = st.columns(2)
+            download_csv(df_pos, "hasil_topik_positif.csv", "Hasil Topik Positif")
+        # ---------- NEGATIVE ----------
+        with col2:
+            st.subheader("🔴 Topik Sentimen Negatif")
 
-    # ---------- POSITIVE ----------
-    with col1:
+            df_neg = st.session_state.df_neg
+            topic_neg_counts = df_neg["Topic"].value_counts()
+
+            fig = topic_bar_chart(topic_neg_counts, "Distribusi Topik Negatif")
+            st.pyplot(fig)
+            close_chart(fig)
+
+            st.markdown("**📌 Interpretasi Topik Negatif:**")
+            st.write(topic_interpretation(topic_neg_counts, neg_label_map, "negatif"))
+
+            with st.expander("🔍 Lihat Detail"):
+                paged_dataframe(df_neg, "neg")
+
+            download_csv(df_neg, "hasil_topik_negatif.csv", "Hasil Topik Negatif")
+    # JIKA HANYA POSITIF
+    elif has_pos:
         st.subheader("🟢 Topik Sentimen Positif")
 
         df_pos = st.session_state.df_pos
@@ -214,17 +459,17 @@ if has_pos and has_neg:
 
         fig = topic_bar_chart(topic_pos_counts, "Distribusi Topik Positif")
         st.pyplot(fig)
-        plt.close(fig)
+        close_chart(fig)
 
         st.markdown("**📌 Interpretasi Topik Positif:**")
         st.write(topic_interpretation(topic_pos_counts, pos_label_map, "positif"))
 
         with st.expander("🔍 Lihat Detail"):
-            st.dataframe(df_pos, use_container_width=True)
+            paged_dataframe(df_pos, "pos")
 
         download_csv(df_pos, "hasil_topik_positif.csv", "Hasil Topik Positif")
-    # ---------- NEGATIVE ----------
-    with col2:
+    # JIKA HANYA NEGATIF
+    elif has_neg:
         st.subheader("🔴 Topik Sentimen Negatif")
 
         df_neg = st.session_state.df_neg
@@ -232,48 +477,68 @@ if has_pos and has_neg:
 
         fig = topic_bar_chart(topic_neg_counts, "Distribusi Topik Negatif")
         st.pyplot(fig)
-        plt.close(fig)
+        close_chart(fig)
 
         st.markdown("**📌 Interpretasi Topik Negatif:**")
         st.write(topic_interpretation(topic_neg_counts, neg_label_map, "negatif"))
 
         with st.expander("🔍 Lihat Detail"):
-            st.dataframe(df_neg, use_container_width=True)
+            paged_dataframe(df_neg, "neg")
 
         download_csv(df_neg, "hasil_topik_negatif.csv", "Hasil Topik Negatif")
-# JIKA HANYA POSITIF
-elif has_pos:
-    st.subheader("🟢 Topik Sentimen Positif")
-
-    df_pos = st.session_state.df_pos
-    topic_pos_counts = df_pos["Topic"].value_counts()
-
-    fig = topic_bar_chart(topic_pos_counts, "Distribusi Topik Positif")
-    st.pyplot(fig)
-    plt.close(fig)
-
-    st.markdown("**📌 Interpretasi Topik Positif:**")
-    st.write(topic_interpretation(topic_pos_counts, pos_label_map, "positif"))
-
-    with st.expander("🔍 Lihat Detail"):
-        st.dataframe(df_pos, use_container_width=True)
-
-    download_csv(df_pos, "hasil_topik_positif.csv", "Hasil Topik Positif")
-# JIKA HANYA NEGATIF
-elif has_neg:
-    st.subheader("🔴 Topik Sentimen Negatif")
 
-    df_neg = st.session_state.df_neg
-    topic_neg_counts = df_neg["Topic"].value_counts()
+if profiler is not None:
+    st.session_state.profile_report = profiler.report
 
-    fig = topic_bar_chart(topic_neg_counts, "Distribusi Topik Negatif")
-    st.pyplot(fig)
-    plt.close(fig)
+# --- Similar Review Search ---
+if len(st.session_state.review_index) or len(get_archive_index()):
+    st.subheader("🔎 Cari Ulasan Serupa")
 
-    st.markdown("**📌 Interpretasi Topik Negatif:**")
-    st.write(topic_interpretation(topic_neg_counts, neg_label_map, "negatif"))
-
-    with st.expander("🔍 Lihat Detail"):
-        st.dataframe(df_neg, use_container_width=True)
-
-    download_csv(df_neg, "hasil_topik_negatif.csv", "Hasil Topik Negatif")
+    search_scope = st.radio(
+        "Cari di:",
+        ["Hasil sesi ini", "Semua ulasan yang pernah dianalisis"],
+        horizontal=True
+    )
+    query = st.text_input("Masukkan contoh ulasan")
+    top_k = st.slider("Jumlah ulasan serupa", min_value=1, max_value=50, value=10)
+
+    if query.strip():
+        index = (
+            st.session_state.review_index
+            if search_scope == "Hasil sesi ini"
+            else get_archive_index()
+        )
+        # Each index is queried with the embedder that produced its vectors
+        with registry.acquire() as (_, search_models):
+            embedders = {
+                search_models["pos_emb_rev"]: search_models["pos_mod"],
+                search_models["neg_emb_rev"]: search_models["neg_mod"]
+            }
+            st.dataframe(
+                index.search(embedders, preprocess_batch([query])[0], top_k),
+                use_container_width=True
+            )
+        if set(index.revisions()) - set(embedders):
+            st.caption("Ulasan yang dianalisis dengan versi model sebelumnya tidak ikut dicari.")
+
+# --- Profiling Report (?profile=1 or JKT_PROFILE=1) ---
+if st.session_state.profile_report is not None and profiling_enabled():
+    report = st.session_state.profile_report
+    with st.expander("🔬 Profil Run"):
+        st.caption(
+            f"{report['name']}: {report['duration']:.2f} detik, {report['samples']} sampel. "
+            f"Disimpan di `{report['speedscope_path']}` dan `{report['torch_path']}`."
+        )
+        st.download_button(
+            label="Download Flame Graph (speedscope)",
+            data=report["speedscope"],
+            file_name=f"{report['name']}.speedscope.json",
+            mime="application/json"
+        )
+        st.download_button(
+            label="Download Tabel Operator Torch",
+            data=report["torch_table"],
+            file_name=f"{report['name']}_torch_ops.txt",
+            mime="text/plain"
+        )
+        st.code(report["torch_table"])
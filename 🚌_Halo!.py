@@ -1,5 +1,5 @@
 import streamlit as st
-from helper.model_loader import load_all_models
+from helper.registry import get_model_registry
 
 # --- Page Config ---
 st.set_page_config(
@@ -10,8 +10,7 @@ st.set_page_config(
 )
 
 # --- Initialize Models ---
-if "models" not in st.session_state:
-    st.session_state.models = load_all_models()
+get_model_registry()
 
 # --- Brief Explanation ---
 st.title("🚌 Analisis Ulasan Aplikasi Transportasi Publik")